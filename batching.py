@@ -0,0 +1,174 @@
+from urllib.parse import parse_qs, urlsplit
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from initial_data import read_page_items
+from metrics import timed
+from readiness import navigate
+from selector_registry import probe
+from state import ALREADY_PRESENT, DONE, FAILED
+from utils import YOUTUBE_URL, video_id
+
+# watch_videos accepts at most 50 IDs per anonymous playlist
+MAX_BATCH_SIZE = 50
+
+# Follows the watch_videos redirect with fetch() and aborts once the headers
+# are in: the final URL carries the temporary playlist's ID, so the watch page
+# never has to load or render.
+RESOLVE_BATCH_JS = """
+const url = arguments[0];
+const done = arguments[arguments.length - 1];
+const controller = new AbortController();
+fetch(url, {credentials: 'include', signal: controller.signal})
+    .then((response) => { const finalUrl = response.url; controller.abort(); done(finalUrl); })
+    .catch((e) => done(null));
+"""
+
+# aria-checked of the checkbox an option label sits in
+OPTION_CHECKED_JS = """
+const box = arguments[0].closest('tp-yt-paper-checkbox, [role="checkbox"], [aria-checked]');
+return box ? box.getAttribute('aria-checked') : null;
+"""
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def resolve_batch_playlist(driver, video_ids, base_url=YOUTUBE_URL):
+    """ID of the anonymous playlist YouTube builds for watch_videos?video_ids=…, or None"""
+    driver.set_script_timeout(30)
+    with timed("resolve"):
+        final_url = driver.execute_async_script(RESOLVE_BATCH_JS, f"{base_url}/watch_videos?video_ids={','.join(video_ids)}")
+    if not final_url:
+        return None
+    return (parse_qs(urlsplit(final_url).query).get("list") or [None])[0]
+
+def option_checked(driver, found):
+    """Whether a probed playlist option in a save dialog is ticked"""
+    try:
+        return driver.execute_script(OPTION_CHECKED_JS, found['element']) == "true"
+    except Exception:
+        return False
+
+def create_playlist_in_dialog(driver, playlist_name):
+    """
+    In an open save dialog, create playlist_name; whatever the dialog was
+    opened for (one video, or every video after "Add all to…") goes into it.
+    """
+    create = probe(driver, "create-playlist-option", timeout=5, required=["new playlist"])
+    if not create:
+        print(f"  ✗ Could not find 'New playlist' in the save dialog")
+        return False
+    with timed("click"):
+        create['element'].click()
+    field = probe(driver, "playlist-title-input", timeout=5)
+    if not field:
+        print(f"  ✗ Could not find the playlist title field")
+        return False
+    field['element'].send_keys(playlist_name)
+    button = probe(driver, "create-playlist-button", timeout=5, required=["create"])
+    if not button:
+        print(f"  ✗ Could not find the Create button")
+        return False
+    with timed("click"):
+        button['element'].click()
+    print(f"  ✓ Created playlist '{playlist_name}'")
+    return True
+
+def add_batch_to_playlist(driver, video_ids, base_url=YOUTUBE_URL, playlist_name="Watch later", debug=False):
+    """
+    Add a chunk of videos to playlist_name in one operation: build an anonymous
+    playlist from them, open it, and use its "Add all to…" menu. Returns
+    {video_id: status} for the videos that went in with the chunk; the others
+    (unavailable videos YouTube left out, or the whole chunk if the menu flow
+    fails) are left for the per-video path.
+    """
+    playlist_id = resolve_batch_playlist(driver, video_ids, base_url)
+    if not playlist_id:
+        print(f"  ✗ Could not build an anonymous playlist for {len(video_ids)} videos")
+        return {}
+
+    navigate(driver, f"{base_url}/playlist?list={playlist_id}", "playlist")
+    parsed = read_page_items(driver)
+    included = {video["id"] for video in parsed["videos"]} if parsed else set(video_ids)
+    chunk = [key for key in video_ids if key in included]
+    if len(chunk) < len(video_ids):
+        print(f"  ~ {len(video_ids) - len(chunk)} videos are not in the anonymous playlist (unavailable?)")
+    if not chunk:
+        return {}
+
+    menu = probe(driver, "playlist-menu", timeout=5, required=["more actions"])
+    if not menu:
+        print(f"  ✗ Could not find the playlist menu")
+        return {}
+    with timed("click"):
+        menu['element'].click()
+
+    add_all = probe(driver, "add-all-option", timeout=5, required=["add all"])
+    if not add_all:
+        print(f"  ✗ Could not find 'Add all to…' in the playlist menu")
+        return {}
+    with timed("click"):
+        add_all['element'].click()
+
+    option = probe(driver, "playlist-option", timeout=5, required=[playlist_name.lower()], exact=True)
+    if not option:
+        print(f"  ✗ Could not find '{playlist_name}' in the save dialog")
+        return {}
+    if debug:
+        print(f"  found '{option['text']}' via selector {option['selector']} in {option['ms']:.0f} ms")
+
+    # A ticked box means everything is already there; clicking would remove it
+    if option_checked(driver, option):
+        return {key: ALREADY_PRESENT for key in chunk}
+    with timed("click"):
+        option['element'].click()
+    try:
+        with timed("confirm"):
+            WebDriverWait(driver, 5, poll_frequency=0.25).until(lambda d: option_checked(d, option))
+    except TimeoutException:
+        print(f"  ✗ '{playlist_name}' did not get ticked after 'Add all to…'")
+        return {}
+    return {key: DONE for key in chunk}
+
+def add_videos_in_batches(driver, video_urls, rate, base_url=YOUTUBE_URL, batch_size=MAX_BATCH_SIZE,
+                          playlist_name="Watch later", debug=False, on_result=None):
+    """
+    Batch mode for Watch Later (or any playlist): one anonymous playlist per
+    batch_size videos instead of one watch page per video. on_result(url,
+    status) is called for every video added in a batch. Returns the URLs
+    that still need the per-video path.
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    fallback = []
+    keyed = [(video_id(url), url) for url in video_urls]
+    fallback.extend(url for key, url in keyed if key is None)
+    batches = list(chunked([(key, url) for key, url in keyed if key], batch_size))
+
+    # The redirect is resolved with a same-origin fetch, so start from a YouTube page
+    if batches and not driver.current_url.startswith(base_url):
+        navigate(driver, base_url)
+
+    for n, batch in enumerate(batches, 1):
+        with timed("rate_limit_sleep"):
+            rate.acquire()
+        print(f"\nProcessing {playlist_name} batch {n}/{len(batches)} ({len(batch)} videos)")
+        try:
+            results = add_batch_to_playlist(driver, [key for key, _ in batch], base_url, playlist_name, debug)
+        except Exception as e:
+            print(f"  ✗ Batch failed: {e}")
+            results = {}
+        rate.record(DONE if results else FAILED)
+        for key, url in batch:
+            if key in results:
+                if on_result:
+                    on_result(url, results[key])
+            else:
+                fallback.append(url)
+        print(f"  ✓ {len(results)} added in one operation, {len(batch) - len(results)} left for the per-video path")
+    return fallback
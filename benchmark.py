@@ -0,0 +1,211 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from functools import partial
+from browser import create_driver
+from fixture_server import FixtureServer
+from metrics import RunMetrics, percentile, set_default_metrics
+from migrator import migrate_youtube_data
+from scraper import scrape_youtube_data
+from selector_registry import SelectorRegistry, set_default_registry
+from utils import count_webdriver_commands
+
+class TimingRate:
+    """
+    Rate controller stand-in for benchmarks: never sleeps, and measures each
+    item from acquire() to the record() the migrator makes for it.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.statuses = Counter()
+
+    def acquire(self):
+        self._local.start = time.perf_counter()
+
+    def record(self, status, throttled=False):
+        elapsed = time.perf_counter() - getattr(self._local, "start", time.perf_counter())
+        with self._lock:
+            self.latencies.append(elapsed)
+            self.statuses[status] += 1
+
+    @property
+    def current_rate(self):
+        return None
+
+def git_revision():
+    """(short commit hash, dirty flag) of the working tree, or (None, None) outside git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+def run_benchmark(subscriptions=50, watch_later=300, page_size=100, latency_ms=50, render_delay_ms=200,
+                  workers=1, headless=True, lean=False, scroll_loader="event", tab_depth=1, watch_later_batch=0,
+                  backend="initial-data", compare_extraction=False):
+    """
+    Scrape and migrate the fixture server's synthetic account once and return
+    the measurements. scroll_loader only matters with backend="dom": the
+    default backend reads ytInitialData and never scrolls. compare_extraction
+    prints the legacy vs bulk link extraction report, which only the DOM path
+    has, so it implies backend="dom".
+    """
+    if compare_extraction:
+        backend = "dom"
+    config = {
+        "subscriptions": subscriptions, "watch_later": watch_later, "page_size": page_size,
+        "latency_ms": latency_ms, "render_delay_ms": render_delay_ms, "workers": workers,
+        "headless": headless, "lean": lean, "scroll_loader": scroll_loader, "tab_depth": tab_depth,
+        "watch_later_batch": watch_later_batch, "backend": backend, "compare_extraction": compare_extraction,
+    }
+    workdir = tempfile.mkdtemp(prefix="ytm-benchmark-")
+    set_default_registry(SelectorRegistry(os.path.join(workdir, "selector-stats.json")))
+    metrics = RunMetrics()
+    set_default_metrics(metrics)
+    data_path = os.path.join(workdir, "youtube-data.json")
+    total = subscriptions + watch_later
+
+    with FixtureServer(subscriptions, watch_later, page_size, latency_ms, render_delay_ms) as server:
+        driver = create_driver(lean=lean, headless=headless)
+        try:
+            with count_webdriver_commands(driver) as scrape_commands:
+                start = time.perf_counter()
+                data = scrape_youtube_data(driver, scroll_loader=scroll_loader, base_url=server.base_url,
+                                           output_path=data_path, backend=backend,
+                                           compare_extraction=compare_extraction)
+                scrape_seconds = time.perf_counter() - start
+            scraped = sum(len(items) for items in data.values())
+
+            rate = TimingRate()
+            with count_webdriver_commands(driver) as migrate_commands:
+                start = time.perf_counter()
+                migrate_youtube_data(
+                    driver, workers=workers, driver_factory=partial(create_driver, lean=lean, headless=headless),
+                    rate_controller=rate, plan=False, mode="1", base_url=server.base_url, data_path=data_path,
+                    tab_depth=tab_depth, watch_later_batch=watch_later_batch,
+                    # Backoff sleeps would dominate the timings; failures show up in the statuses instead
+                    retries=False,
+                )
+                migrate_seconds = time.perf_counter() - start
+            state = server.state()
+        finally:
+            driver.quit()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    migrated = len(state["subscribed"]) + len(state["saved"].get("WL", []))
+    return {
+        "config": config,
+        "phases": metrics.summary()["phases"],
+        "scrape": {
+            "items": scraped,
+            "complete": scraped == total,
+            "seconds": scrape_seconds,
+            "items_per_sec": scraped / scrape_seconds if scrape_seconds else None,
+            "commands": sum(scrape_commands.values()),
+            "commands_per_item": sum(scrape_commands.values()) / scraped if scraped else None,
+            "command_breakdown": dict(scrape_commands),
+        },
+        "migrate": {
+            "items": len(rate.latencies),
+            "confirmed_by_server": migrated,
+            "statuses": dict(rate.statuses),
+            "seconds": migrate_seconds,
+            "items_per_sec": len(rate.latencies) / migrate_seconds if migrate_seconds else None,
+            "p50_seconds": percentile(rate.latencies, 0.5),
+            "p95_seconds": percentile(rate.latencies, 0.95),
+            # Pool workers talk to their own drivers; only the primary driver is counted
+            "commands": sum(migrate_commands.values()),
+            "commands_per_item": sum(migrate_commands.values()) / len(rate.latencies) if rate.latencies and workers == 1 else None,
+            "command_breakdown": dict(migrate_commands),
+        },
+    }
+
+def save_result(result, directory="data/benchmarks"):
+    """Write one result file named by time and commit, so runs on different commits sit side by side"""
+    commit, dirty = git_revision()
+    result = dict(result, commit=commit, dirty=dirty, timestamp=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(directory, f"{stamp}-{commit or 'nogit'}{'-dirty' if dirty else ''}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=4)
+    return path
+
+def previous_result(path, config, directory="data/benchmarks"):
+    """Most recent earlier result with the same config, or None"""
+    for candidate in sorted(glob.glob(os.path.join(directory, "*.json")), reverse=True):
+        if os.path.abspath(candidate) == os.path.abspath(path):
+            continue
+        try:
+            with open(candidate) as f:
+                earlier = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if earlier.get("config") == config:
+            return earlier
+    return None
+
+def _format(value, unit=""):
+    if value is None:
+        return "n/a"
+    return f"{value:.3f}{unit}" if isinstance(value, float) else f"{value}{unit}"
+
+def print_result(result, earlier=None):
+    rows = [
+        ("scrape", "items_per_sec", " items/s"),
+        ("scrape", "commands_per_item", ""),
+        ("migrate", "items_per_sec", " items/s"),
+        ("migrate", "p50_seconds", "s"),
+        ("migrate", "p95_seconds", "s"),
+        ("migrate", "commands_per_item", ""),
+    ]
+    print(f"\n--- Benchmark ({result['config']['subscriptions']} subscriptions, {result['config']['watch_later']} videos) ---")
+    print(f"Scraped {result['scrape']['items']} items ({'complete' if result['scrape']['complete'] else 'INCOMPLETE'}), "
+          f"migrated {result['migrate']['confirmed_by_server']}/{result['migrate']['items']} confirmed by the server")
+    if earlier:
+        print(f"Compared with {earlier.get('commit')} ({earlier.get('timestamp')})")
+    for phase, metric, unit in rows:
+        value = result[phase][metric]
+        line = f"{phase:>8} {metric:<18} {_format(value, unit):>16}"
+        before = earlier.get(phase, {}).get(metric) if earlier else None
+        if before and value is not None:
+            line += f"   was {_format(before, unit)} ({(value - before) / before:+.1%})"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape and migrate against the local fixture server")
+    parser.add_argument("--subscriptions", type=int, default=50)
+    parser.add_argument("--watch-later", type=int, default=300)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--render-delay-ms", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--tabs", type=int, default=1, help="tab pipeline depth")
+    parser.add_argument("--wl-batch", type=int, default=0, help="Watch Later videos per anonymous playlist")
+    parser.add_argument("--backend", choices=["initial-data", "dom"], default="initial-data",
+                        help="where the scrape reads items from; dom scrolls the page with --scroll-loader")
+    parser.add_argument("--scroll-loader", choices=["event", "legacy"], default="event")
+    parser.add_argument("--compare-extraction", action="store_true",
+                        help="report round trips and time of the legacy vs bulk extraction (uses --backend dom)")
+    parser.add_argument("--lean", action="store_true")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.subscriptions, args.watch_later, args.page_size, args.latency_ms,
+                           args.render_delay_ms, args.workers, not args.headed, args.lean, args.scroll_loader,
+                           args.tabs, args.wl_batch, args.backend, args.compare_extraction)
+    path = save_result(result)
+    print_result(result, previous_result(path, result["config"]))
+    print(f"\nResult saved to {path}")
@@ -0,0 +1,231 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import undetected_chromedriver as uc
+
+# Patched chromedriver binaries, one per Chrome major version
+DRIVER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "youtube-migration-tool", "chromedriver")
+
+# Requests the migration never needs: thumbnails/avatars, video segments,
+# fonts, and ad/telemetry hosts. Patterns use CDP's wildcard syntax.
+LEAN_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*i.ytimg.com/*", "*yt3.ggpht.com/*", "*yt3.googleusercontent.com/*",
+    "*googlevideo.com/videoplayback*", "*.mp4", "*.webm", "*.m4a",
+    "*doubleclick.net/*", "*googlesyndication.com/*", "*googleadservices.com/*",
+    "*google-analytics.com/*", "*googletagservices.com/*", "*googletagmanager.com/*",
+    "*youtube.com/api/stats/*", "*youtube.com/ptracking*", "*youtube.com/pagead/*",
+    "*youtube.com/generate_204*", "*youtube.com/youtubei/v1/log_event*", "*play.google.com/log*",
+]
+
+def chrome_options(lean=False, headless=False):
+    """Chrome options shared by every driver the tool launches"""
+    options = uc.ChromeOptions()
+
+    # Add some common options to prevent issues
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+
+    # Return from driver.get() at DOMContentLoaded; readiness.navigate() then
+    # waits on YouTube's own signals instead of every image and script.
+    options.page_load_strategy = "eager"
+
+    if lean:
+        # No autoplay, no sound, and images blocked at the content-settings level too
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_argument("--mute-audio")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+
+    if headless:
+        options.add_argument("--headless=new")
+
+    return options
+
+def apply_lean_mode(driver):
+    """Block LEAN_BLOCKED_URLS for the current tab through CDP; call again for new tabs"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        return True
+    except Exception as e:
+        print(f"! Could not enable request blocking: {e}")
+        return False
+
+def _windows_chrome_version(executable):
+    """
+    Chrome's version on Windows, where `chrome --version` prints nothing and
+    opens a browser window instead: the BLBeacon registry key Chrome keeps up
+    to date, else the executable's file version.
+    """
+    import winreg
+
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            continue
+    if not executable:
+        return ""
+    quoted = executable.replace("'", "''")
+    command = f"(Get-Item -LiteralPath '{quoted}').VersionInfo.ProductVersion"
+    return subprocess.run(
+        ["powershell", "-NoProfile", "-Command", command], capture_output=True, text=True, timeout=10
+    ).stdout
+
+def chrome_major_version():
+    """Installed Chrome's major version, or None if it can't be determined"""
+    try:
+        executable = uc.find_chrome_executable()
+        if sys.platform.startswith("win"):
+            output = _windows_chrome_version(executable)
+        elif executable:
+            output = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=10).stdout
+        else:
+            return None
+    except Exception:
+        return None
+    match = re.search(r"(\d+)\.\d+\.\d+", output or "")
+    return int(match.group(1)) if match else None
+
+def cached_driver_path(version):
+    name = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+    return os.path.join(DRIVER_CACHE_DIR, str(version), name)
+
+def _cache_patched_driver(driver, version):
+    """Keep the binary undetected_chromedriver just downloaded and patched for the next launch"""
+    source = getattr(getattr(driver, "patcher", None), "executable_path", None)
+    target = cached_driver_path(version)
+    if not source or not os.path.exists(source) or os.path.abspath(source) == os.path.abspath(target):
+        return
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(source, target)
+    except OSError as e:
+        print(f"! Could not cache patched chromedriver: {e}")
+
+def create_driver(user_data_dir=None, lean=False, headless=False, use_cache=True):
+    """
+    Launch an undetected Chrome instance with the standard options (optionally
+    lean and/or new-headless). The patched chromedriver is cached per Chrome
+    major version so later launches skip the download-and-patch step.
+    """
+    kwargs = {"options": chrome_options(lean, headless), "user_data_dir": user_data_dir}
+    version = chrome_major_version() if use_cache else None
+    cached = cached_driver_path(version) if version else None
+    if version:
+        kwargs["version_main"] = version
+    if cached and os.path.exists(cached):
+        kwargs["driver_executable_path"] = cached
+
+    driver = uc.Chrome(**kwargs)
+    if version and "driver_executable_path" not in kwargs:
+        _cache_patched_driver(driver, version)
+    # Remembered so tabs opened later (tab_pipeline.py) get the same blocking
+    driver.lean_mode = lean
+    if lean:
+        apply_lean_mode(driver)
+    return driver
+
+def health_check(driver):
+    """Local check that the browser answers commands, without a network round trip"""
+    try:
+        return driver.execute_script("return document.readyState") is not None
+    except Exception:
+        return False
+
+def chrome_rss_mb(driver):
+    """Resident memory of the whole Chrome process tree (browser + renderers + GPU) in MB"""
+    root_pid = getattr(driver, "browser_pid", None)
+    if not root_pid:
+        return None
+    try:
+        import psutil
+        root = psutil.Process(root_pid)
+        processes = [root] + root.children(recursive=True)
+        return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    # Linux fallback without psutil: walk /proc for the tree under root_pid
+    try:
+        parents = {}
+        rss_kb = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/status") as f:
+                    fields = dict(line.split(":", 1) for line in f if ":" in line)
+            except OSError:
+                continue
+            parents[int(entry)] = int(fields.get("PPid", "0").strip())
+            rss_kb[int(entry)] = int(fields.get("VmRSS", "0 kB").split()[0])
+        tree = {root_pid}
+        changed = True
+        while changed:
+            changed = False
+            for pid, parent in parents.items():
+                if parent in tree and pid not in tree:
+                    tree.add(pid)
+                    changed = True
+        return sum(rss_kb.get(pid, 0) for pid in tree) / 1024
+    except OSError:
+        return None
+
+def measure_page_loads(driver, urls, page_type="channel"):
+    """Per-item navigation time and Chrome RSS for a list of URLs"""
+    from readiness import navigate
+
+    results = []
+    for url in urls:
+        start = time.perf_counter()
+        navigate(driver, url, page_type)
+        results.append({
+            "url": url,
+            "seconds": time.perf_counter() - start,
+            "rss_mb": chrome_rss_mb(driver),
+        })
+    return results
+
+def compare_lean_mode(urls, page_type="channel", headless=False):
+    """Load the same URLs with the standard and the lean profile and print per-item load time and RSS"""
+    summary = {}
+    for label, lean in (("standard", False), ("lean", True)):
+        driver = create_driver(lean=lean, headless=headless)
+        try:
+            results = measure_page_loads(driver, urls, page_type)
+        finally:
+            driver.quit()
+        seconds = [result["seconds"] for result in results]
+        rss = [result["rss_mb"] for result in results if result["rss_mb"] is not None]
+        summary[label] = {
+            "avg_seconds": sum(seconds) / len(seconds),
+            "avg_rss_mb": sum(rss) / len(rss) if rss else None,
+            "peak_rss_mb": max(rss) if rss else None,
+        }
+
+    print(f"\n--- Lean mode comparison ({len(urls)} {page_type} pages) ---")
+    for label, stats in summary.items():
+        rss_text = f"avg RSS {stats['avg_rss_mb']:.0f} MB, peak {stats['peak_rss_mb']:.0f} MB" if stats["avg_rss_mb"] else "RSS unavailable"
+        print(f"{label:>8}: {stats['avg_seconds']:.2f}s per item, {rss_text}")
+    return summary
+
+if __name__ == "__main__":
+    from utils import load_youtube_data
+
+    data = load_youtube_data("data/youtube-data.json")
+    compare_lean_mode(data["subscriptions"].urls()[:10], "channel", headless="--headless" in sys.argv)
+    compare_lean_mode(data["watch_later"].urls()[:10], "video", headless="--headless" in sys.argv)
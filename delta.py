@@ -0,0 +1,68 @@
+import json
+import os
+from datetime import datetime, timezone
+from utils import ItemSet
+
+class KnownRun:
+    """
+    Watches IDs in page order during an incremental scrape and reports once
+    threshold already-known IDs have appeared in a row: past that point the
+    list is assumed unchanged since the previous snapshot.
+    """
+
+    def __init__(self, known, threshold=20):
+        self.known = known
+        self.threshold = threshold
+        self.run = 0
+        self.reached = False
+
+    def feed(self, keys):
+        """Track the next keys in page order; True once loading can stop"""
+        for key in keys:
+            self.run = self.run + 1 if key in self.known else 0
+            if self.run >= self.threshold:
+                self.reached = True
+        return self.reached
+
+def compute_delta(previous, seen, complete):
+    """
+    Merge a (possibly partial) scrape with the previous snapshot. Returns the
+    current ItemSet and {"added", "removed", "complete"}. When the scrape
+    stopped early, only the stretch of the previous snapshot it covered can
+    show removals; everything after it is carried over unchanged.
+    """
+    added = [key for key in seen if key not in previous]
+    previous_keys = list(previous)
+    if complete:
+        covered = len(previous_keys)
+    else:
+        positions = {key: index for index, key in enumerate(previous_keys)}
+        covered = max((positions[key] + 1 for key in seen if key in positions), default=0)
+    removed = [key for key in previous_keys[:covered] if key not in seen]
+
+    current = ItemSet(seen.kind, seen)
+    for key in previous_keys[covered:]:
+        current.add(key)
+    return current, {"added": added, "removed": removed, "complete": complete}
+
+def merge_partial(previous, seen):
+    """
+    Like compute_delta for a list that could not be loaded to its end, in no
+    known order: nothing counts as removed, and every item of the previous
+    snapshot that wasn't seen is kept after the seen ones.
+    """
+    current = ItemSet(seen.kind, seen)
+    for key in previous:
+        current.add(key)
+    return current, {"added": [key for key in seen if key not in previous], "removed": [], "complete": False}
+
+def save_delta(path, delta):
+    """Write the per-section delta of one incremental run, with a timestamp and the sections that stopped early"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = {
+        "scraped_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "partial": sorted(name for name, section in delta.items() if not section["complete"]),
+    }
+    payload.update(delta)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=4)
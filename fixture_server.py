@@ -0,0 +1,529 @@
+import argparse
+import hashlib
+import html
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from utils import channel_id, video_id
+
+def fixture_channels(count):
+    """Synthetic channel keys, stable across runs so benchmark results stay comparable"""
+    return [f"@fixture{n:05d}" for n in range(1, count + 1)]
+
+def fixture_videos(count):
+    """Synthetic 11-character video IDs"""
+    return [f"fx{n:09d}" for n in range(1, count + 1)]
+
+def fixture_playlists(count, size):
+    """{playlist ID: {"title", "videos"}} for count user playlists of size videos each"""
+    return {
+        f"PLfixture{n:05d}": {"title": f"Fixture playlist {n}", "videos": [f"fp{n:03d}{i:06d}" for i in range(1, size + 1)]}
+        for n in range(1, count + 1)
+    }
+
+# Shared by every page: renders the <template id="deferred"> content after
+# renderDelay ms, like YouTube's client-side render, then fires the SPA events
+# readiness.py waits for and runs the page's own init(). bindCreate wires a
+# save dialog's "Create new playlist" form.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title} - YouTube</title>
+<style>
+  ytd-channel-renderer, ytd-playlist-video-renderer, ytd-continuation-item-renderer {{ display: block; height: 90px; }}
+  ytd-menu-renderer, ytd-subscribe-button-renderer {{ display: inline-block; }}
+</style>
+</head>
+<body>
+<ytd-app id="app"></ytd-app>
+<template id="deferred">{body}</template>
+{initial_data_script}
+<script>
+  const PAGE = {page_json};
+  let init = () => {{}};
+  const bindCreate = (container, query) => {{
+    const create = container.querySelector("ytd-add-to-playlist-create-renderer");
+    create.querySelector("#open-create").addEventListener("click", (event) => {{
+      event.stopPropagation();
+      create.querySelector("#create-form").style.display = "block";
+    }});
+    create.querySelector("#create-button button").addEventListener("click", (event) => {{
+      event.stopPropagation();
+      const title = create.querySelector("input").value;
+      fetch("/fixture/create-playlist?title=" + encodeURIComponent(title) + "&" + query, {{method: "POST"}})
+        .then(() => {{ container.style.display = "none"; }});
+    }});
+  }};
+  {script}
+  setTimeout(() => {{
+    document.getElementById("app").appendChild(document.getElementById("deferred").content.cloneNode(true));
+    init();
+    document.dispatchEvent(new CustomEvent("yt-navigate-finish"));
+    document.dispatchEvent(new CustomEvent("yt-page-data-updated"));
+  }}, PAGE.renderDelay);
+</script>
+</body>
+</html>
+"""
+
+CHANNEL_SCRIPT = """
+init = () => {
+  const renderer = document.querySelector("ytd-subscribe-button-renderer");
+  const button = renderer.querySelector("button");
+  const render = (subscribed) => {
+    renderer.toggleAttribute("subscribed", subscribed);
+    button.textContent = subscribed ? "Subscribed" : "Subscribe";
+    button.setAttribute("aria-label", (subscribed ? "Unsubscribe from " : "Subscribe to ") + PAGE.title);
+  };
+  render(PAGE.subscribed);
+  button.addEventListener("click", () => {
+    fetch("/fixture/subscribe?channel=" + encodeURIComponent(PAGE.channel), {method: "POST"})
+      .then(() => render(true));
+  });
+};
+"""
+
+WATCH_SCRIPT = """
+init = () => {
+  const menu = document.getElementById("save-menu");
+  document.querySelector("#top-level-buttons-computed button").addEventListener("click", () => {
+    menu.style.display = "block";
+  });
+  menu.addEventListener("click", (event) => {
+    const option = event.target.closest("ytd-playlist-add-to-option-renderer");
+    if (!option) return;
+    fetch("/fixture/save?v=" + PAGE.video + "&list=" + option.dataset.list, {method: "POST"}).then(() => {
+      option.querySelector("tp-yt-paper-checkbox").setAttribute("aria-checked", "true");
+      menu.style.display = "none";
+    });
+  });
+  bindCreate(menu, "v=" + PAGE.video);
+};
+"""
+
+# Loads the next page of the playlist whenever the continuation spinner is
+# within a screen of the viewport, the way YouTube's infinite scroll does.
+PLAYLIST_SCRIPT = """
+init = () => {
+  let offset = PAGE.offset;
+  let loading = false;
+  const poll = () => {
+    const spinner = document.querySelector("ytd-continuation-item-renderer");
+    if (!spinner) return;
+    if (!loading && spinner.getBoundingClientRect().top < window.innerHeight * 2) {
+      loading = true;
+      fetch("/fixture/continuation?list=" + PAGE.list + "&offset=" + offset)
+        .then((response) => response.json())
+        .then((page) => {
+          spinner.insertAdjacentHTML("beforebegin", page.html);
+          offset = page.next;
+          if (offset === null) spinner.remove();
+          loading = false;
+        });
+    }
+    setTimeout(poll, 100);
+  };
+  poll();
+  const menu = document.getElementById("playlist-menu");
+  const dialog = document.getElementById("save-dialog");
+  document.querySelector("ytd-playlist-header-renderer ytd-menu-renderer button").addEventListener("click", () => {
+    menu.style.display = "block";
+  });
+  menu.addEventListener("click", () => {
+    menu.style.display = "none";
+    dialog.style.display = "block";
+  });
+  dialog.addEventListener("click", (event) => {
+    const option = event.target.closest("ytd-playlist-add-to-option-renderer");
+    if (!option) return;
+    fetch("/fixture/save-all?list=" + PAGE.list + "&target=" + option.dataset.list, {method: "POST"}).then(() => {
+      option.querySelector("tp-yt-paper-checkbox").setAttribute("aria-checked", "true");
+    });
+  });
+  bindCreate(dialog, "from=" + PAGE.list);
+};
+"""
+
+def _json_script(name, data):
+    payload = json.dumps(data).replace("</", "<\\/")
+    return f"<script>var {name} = {payload};</script>"
+
+def _browse_data(contents, header=None):
+    """ytInitialData shaped like a /browse page: tabs > section list > item section"""
+    data = {"contents": {"twoColumnBrowseResultsRenderer": {"tabs": [{"tabRenderer": {"selected": True, "content": {
+        "sectionListRenderer": {"contents": [{"itemSectionRenderer": {"contents": contents}}]}
+    }}}]}}}
+    if header:
+        data["header"] = header
+    return data
+
+def _channel_data(key):
+    return {"channelRenderer": {
+        "channelId": key,
+        "title": {"simpleText": f"Fixture channel {key}"},
+        "navigationEndpoint": {"browseEndpoint": {"browseId": key, "canonicalBaseUrl": f"/{key}"}},
+    }}
+
+def _playlist_video_data(video, index):
+    return {"playlistVideoRenderer": {
+        "videoId": video,
+        "title": {"runs": [{"text": f"Fixture video {video}"}]},
+        "index": {"simpleText": str(index)},
+    }}
+
+def _continuation_data(token):
+    return {"continuationItemRenderer": {"continuationEndpoint": {
+        "commandMetadata": {"webCommandMetadata": {"apiUrl": "/youtubei/v1/browse"}},
+        "continuationCommand": {"token": token, "request": "CONTINUATION_REQUEST_TYPE_BROWSE"},
+    }}}
+
+def _playlist_tile_data(playlist, title):
+    return {"gridPlaylistRenderer": {"playlistId": playlist, "title": {"runs": [{"text": title}]}}}
+
+def _channel_renderer(key):
+    return (
+        f'<ytd-channel-renderer><a id="main-link" href="/{key}">'
+        f'<span id="channel-title">Fixture channel {html.escape(key)}</span></a></ytd-channel-renderer>'
+    )
+
+def _playlist_video_renderer(video, index, playlist):
+    return (
+        f'<ytd-playlist-video-renderer><a id="video-title" href="/watch?v={video}&amp;list={playlist}&amp;index={index}"'
+        f' title="Fixture video {video}">Fixture video {video}</a></ytd-playlist-video-renderer>'
+    )
+
+class FixtureServer:
+    """
+    Local stand-in for the YouTube pages the tool drives. The feed and Watch
+    Later pages play the source account (subscriptions channels, watch_later
+    videos, loaded page_size at a time); channel and watch pages play the
+    destination, recording subscribe/save clicks in state(). latency_ms is
+    added to every response and render_delay_ms delays each page's render.
+    watch_videos?video_ids=… builds anonymous playlists that leave out every
+    unavailable_every-th video, like YouTube drops deleted/private ones.
+    /feed/playlists lists `playlists` user playlists of playlist_size videos;
+    save dialogs list the playlists created on the destination so far.
+    """
+
+    def __init__(self, subscriptions=50, watch_later=300, page_size=100, latency_ms=0, render_delay_ms=0,
+                 host="127.0.0.1", port=0, unavailable_every=0, playlists=0, playlist_size=20):
+        self.channels = fixture_channels(subscriptions)
+        self.videos = fixture_videos(watch_later)
+        self.user_playlists = fixture_playlists(playlists, playlist_size)
+        self.unavailable = set(self.videos[unavailable_every - 1::unavailable_every]) if unavailable_every else set()
+        self.anonymous_playlists = {}
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.render_delay_ms = render_delay_ms
+        self.host = host
+        self.port = port
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        """Forget every subscribe/save recorded so far"""
+        with self._lock:
+            self.subscribed = set()
+            self.saved = {}
+            self.created = {}
+            self.requests = 0
+
+    def state(self):
+        with self._lock:
+            return {
+                "subscribed": sorted(self.subscribed),
+                "saved": {playlist: list(videos) for playlist, videos in self.saved.items()},
+                "created": dict(self.created),
+                "requests": self.requests,
+            }
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        fixture = self
+
+        class Handler(FixtureHandler):
+            server_fixture = fixture
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def page(self, title, body, script="", initial_data=None, **page_data):
+        page_data.update(title=title, renderDelay=self.render_delay_ms)
+        return PAGE_TEMPLATE.format(
+            title=html.escape(title), body=body, script=script,
+            initial_data_script=_json_script("ytInitialData", initial_data) if initial_data else "",
+            page_json=json.dumps(page_data).replace("</", "<\\/"),
+        )
+
+    def feed_page(self):
+        body = "".join(_channel_renderer(key) for key in self.channels)
+        shelf = {"shelfRenderer": {"content": {"expandedShelfContentsRenderer": {
+            "items": [_channel_data(key) for key in self.channels]
+        }}}}
+        return self.page("Channels", f'<div id="contents">{body}</div>', initial_data=_browse_data([shelf]))
+
+    def feed_playlists_page(self):
+        tiles = [_playlist_tile_data("WL", "Watch later")]
+        tiles += [_playlist_tile_data(playlist, info["title"]) for playlist, info in self.user_playlists.items()]
+        return self.page("Playlists", '<div id="contents"></div>', initial_data=_browse_data(tiles))
+
+    def playlist_videos(self, playlist):
+        if playlist == "WL":
+            return self.videos
+        if playlist in self.user_playlists:
+            return self.user_playlists[playlist]["videos"]
+        with self._lock:
+            return list(self.anonymous_playlists.get(playlist, []))
+
+    def anonymous_playlist(self, video_ids):
+        """Register the watch_videos playlist for video_ids and return its TL… ID"""
+        available = [key for key in video_ids if video_id(key) and key not in self.unavailable]
+        playlist = "TL" + hashlib.sha1(",".join(video_ids).encode()).hexdigest()[:22]
+        with self._lock:
+            self.anonymous_playlists[playlist] = available
+        return playlist, available
+
+    def playlist_items(self, playlist, offset):
+        """(html of the page_size items starting at offset, next offset or None)"""
+        videos = self.playlist_videos(playlist)
+        end = min(offset + self.page_size, len(videos))
+        items = "".join(
+            _playlist_video_renderer(video, index + 1, playlist)
+            for index, video in enumerate(videos[offset:end], offset)
+        )
+        return items, end if end < len(videos) else None
+
+    def playlist_data(self, playlist):
+        """ytInitialData of a playlist page, also what a browse request for "VL" + playlist returns"""
+        videos = self.playlist_videos(playlist)
+        count = len(videos)
+        contents = [_playlist_video_data(video, index) for index, video in enumerate(videos[:self.page_size], 1)]
+        if count > self.page_size:
+            contents.append(_continuation_data(f"{playlist}:{self.page_size}"))
+        return _browse_data(
+            [{"playlistVideoListRenderer": {"playlistId": playlist, "contents": contents}}],
+            {"playlistHeaderRenderer": {"playlistId": playlist, "numVideosText": {"runs": [{"text": f"{count:,}"}, {"text": " videos"}]}}},
+        )
+
+    def save_options(self, video=None):
+        """Save dialog content: an option per destination playlist (ticked if video is in it) and the create form"""
+        with self._lock:
+            targets = [("WL", "Watch later")] + [(playlist, title) for title, playlist in self.created.items()]
+            saved = {playlist: video in videos for playlist, videos in self.saved.items()}
+        options = "".join(
+            f'<ytd-playlist-add-to-option-renderer data-list="{playlist}">'
+            f'<tp-yt-paper-checkbox aria-checked="{"true" if saved.get(playlist) else "false"}">'
+            f'<yt-formatted-string id="label">{html.escape(title)}</yt-formatted-string></tp-yt-paper-checkbox>'
+            f'</ytd-playlist-add-to-option-renderer>'
+            for playlist, title in targets
+        )
+        return options + (
+            '<ytd-add-to-playlist-create-renderer><button id="open-create">Create new playlist</button>'
+            '<div id="create-form" style="display: none"><input placeholder="Choose a title">'
+            '<ytd-button-renderer id="create-button"><button>Create</button></ytd-button-renderer></div>'
+            '</ytd-add-to-playlist-create-renderer>'
+        )
+
+    def playlist_page(self, playlist):
+        items, next_offset = self.playlist_items(playlist, 0)
+        spinner = "<ytd-continuation-item-renderer></ytd-continuation-item-renderer>" if next_offset else ""
+        count = len(self.playlist_videos(playlist))
+        initial_data = self.playlist_data(playlist)
+        body = (
+            f'<ytd-playlist-header-renderer><ytd-playlist-byline-renderer>{count:,} videos</ytd-playlist-byline-renderer>'
+            f'<ytd-menu-renderer><button aria-label="More actions">⋮</button></ytd-menu-renderer>'
+            f'</ytd-playlist-header-renderer>'
+            f'<tp-yt-iron-dropdown id="playlist-menu" style="display: none"><ytd-menu-service-item-renderer>'
+            f'<tp-yt-paper-item><yt-formatted-string>Add all to...</yt-formatted-string></tp-yt-paper-item>'
+            f'</ytd-menu-service-item-renderer></tp-yt-iron-dropdown>'
+            f'<tp-yt-paper-dialog id="save-dialog" style="display: none">{self.save_options()}</tp-yt-paper-dialog>'
+            f'<ytd-playlist-video-list-renderer><div id="contents">{items}{spinner}</div></ytd-playlist-video-list-renderer>'
+        )
+        if playlist == "WL":
+            title = "Watch later"
+        elif playlist in self.user_playlists:
+            title = self.user_playlists[playlist]["title"]
+        else:
+            title = "Mix"
+        return self.page(title, body, PLAYLIST_SCRIPT, initial_data, list=playlist, offset=next_offset)
+
+    def continuation_response(self, token):
+        """youtubei/v1/browse response for a "<playlist>:<offset>" continuation token"""
+        playlist, _, offset = token.rpartition(":")
+        offset = int(offset)
+        videos = self.playlist_videos(playlist)
+        end = min(offset + self.page_size, len(videos))
+        items = [_playlist_video_data(video, index) for index, video in enumerate(videos[offset:end], offset + 1)]
+        if end < len(videos):
+            items.append(_continuation_data(f"{playlist}:{end}"))
+        return {"onResponseReceivedActions": [{"appendContinuationItemsAction": {"continuationItems": items}}]}
+
+    def channel_page(self, key):
+        with self._lock:
+            subscribed = key in self.subscribed
+        title = f"Fixture channel {key}"
+        body = (
+            f'<div id="channel-header"><h1>{html.escape(title)}</h1></div>'
+            f'<div id="inner-header-container"><ytd-subscribe-button-renderer>'
+            f'<button>Subscribe</button></ytd-subscribe-button-renderer></div>'
+        )
+        return self.page(title, body, CHANNEL_SCRIPT, channel=key, subscribed=subscribed)
+
+    def watch_page(self, video):
+        title = f"Fixture video {video}"
+        body = (
+            f'<ytd-watch-metadata><h1>{title}</h1><div id="top-level-buttons-computed">'
+            f'<ytd-menu-renderer><button aria-label="Save to playlist" title="Save">Save</button></ytd-menu-renderer>'
+            f'</div></ytd-watch-metadata>'
+            f'<tp-yt-iron-dropdown id="save-menu" style="display: none">{self.save_options(video)}</tp-yt-iron-dropdown>'
+        )
+        return self.page(title, body, WATCH_SCRIPT, video=video)
+
+    def record_subscribe(self, key):
+        with self._lock:
+            self.subscribed.add(key)
+
+    def create_playlist(self, title, videos):
+        """Destination side of "Create new playlist": a new playlist holding videos; returns its ID"""
+        with self._lock:
+            playlist = self.created.get(title) or f"PLcreated{len(self.created) + 1:05d}"
+            self.created[title] = playlist
+            saved = self.saved.setdefault(playlist, [])
+            saved.extend(video for video in videos if video not in saved)
+        return playlist
+
+    def record_save(self, video, playlist):
+        with self._lock:
+            videos = self.saved.setdefault(playlist, [])
+            if video not in videos:
+                videos.append(video)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server_fixture = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, data):
+        self._send(200, json.dumps(data), "application/json")
+
+    def _begin(self):
+        fixture = self.server_fixture
+        with fixture._lock:
+            fixture.requests += 1
+        if fixture.latency_ms:
+            time.sleep(fixture.latency_ms / 1000)
+        parsed = urlsplit(self.path)
+        return fixture, parsed.path, {key: values[0] for key, values in parse_qs(parsed.query).items()}
+
+    def do_GET(self):
+        fixture, path, query = self._begin()
+        if path in ("/", "/feed/subscriptions"):
+            self._send(200, fixture.page("YouTube", "<div id=\"contents\"></div>"))
+        elif path == "/feed/channels":
+            self._send(200, fixture.feed_page())
+        elif path == "/feed/playlists":
+            self._send(200, fixture.feed_playlists_page())
+        elif path == "/playlist":
+            self._send(200, fixture.playlist_page(query.get("list", "WL")))
+        elif path == "/fixture/continuation":
+            items, next_offset = fixture.playlist_items(query.get("list", "WL"), int(query.get("offset", 0)))
+            self._send_json({"html": items, "next": next_offset})
+        elif path == "/watch_videos":
+            playlist, available = fixture.anonymous_playlist(query.get("video_ids", "").split(","))
+            self.send_response(303 if available else 404)
+            if available:
+                self.send_header("Location", f"/watch?v={available[0]}&list={playlist}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif path == "/fixture/state":
+            self._send_json(fixture.state())
+        elif path == "/watch" and video_id(self.path):
+            self._send(200, fixture.watch_page(video_id(self.path)))
+        elif channel_id(path):
+            self._send(200, fixture.channel_page(channel_id(path)))
+        else:
+            self._send(404, "not found", "text/plain")
+
+    def do_POST(self):
+        fixture, path, query = self._begin()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if path == "/youtubei/v1/browse":
+            try:
+                request = json.loads(body or b"{}")
+                if request.get("browseId", "").startswith("VL"):
+                    self._send_json(fixture.playlist_data(request["browseId"][2:]))
+                else:
+                    self._send_json(fixture.continuation_response(request.get("continuation", "")))
+            except ValueError:
+                self._send(400, "bad continuation", "text/plain")
+        elif path == "/fixture/subscribe" and query.get("channel"):
+            fixture.record_subscribe(query["channel"])
+            self._send_json({"ok": True})
+        elif path == "/fixture/save-all" and query.get("list"):
+            for video in fixture.playlist_videos(query["list"]):
+                fixture.record_save(video, query.get("target", "WL"))
+            self._send_json({"ok": True})
+        elif path == "/fixture/create-playlist" and query.get("title"):
+            videos = fixture.playlist_videos(query["from"]) if query.get("from") else [query.get("v")]
+            self._send_json({"playlistId": fixture.create_playlist(query["title"], [video for video in videos if video])})
+        elif path == "/fixture/save" and query.get("v"):
+            fixture.record_save(query["v"], query.get("list", "WL"))
+            self._send_json({"ok": True})
+        else:
+            self._send(404, "not found", "text/plain")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic YouTube pages for local benchmarks")
+    parser.add_argument("--subscriptions", type=int, default=50)
+    parser.add_argument("--watch-later", type=int, default=300)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--render-delay-ms", type=int, default=0)
+    parser.add_argument("--playlists", type=int, default=0)
+    parser.add_argument("--playlist-size", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FixtureServer(args.subscriptions, args.watch_later, args.page_size, args.latency_ms,
+                           args.render_delay_ms, port=args.port, playlists=args.playlists,
+                           playlist_size=args.playlist_size).start()
+    print(f"Fixture server running at {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,113 @@
+import threading
+from collections import deque
+from metrics import timed
+
+class QueueClosed(Exception):
+    """Raised into the producer when the consumer has stopped taking items"""
+
+class ItemQueue:
+    """
+    Bounded hand-off of (section, canonical ID) pairs from the scraper to the
+    migrator. put() blocks while maxsize items are waiting, so a scrape that
+    outruns the migration pauses instead of piling up; iterating yields items
+    until the producer closes the queue and it is drained.
+    """
+
+    def __init__(self, maxsize=200):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.closed = False
+        self.cancelled = False
+        self.error = None
+        self.produced = 0
+        self.consumed = 0
+        self.peak = 0
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    def put(self, section, key):
+        """Producer side; raises QueueClosed once the consumer has cancelled"""
+        with self._cond:
+            if len(self._items) >= self.maxsize and not self.cancelled:
+                with timed("backpressure"):
+                    while len(self._items) >= self.maxsize and not self.cancelled:
+                        self._cond.wait()
+            if self.cancelled:
+                raise QueueClosed("migration stopped consuming")
+            self._items.append((section, key))
+            self.produced += 1
+            self.peak = max(self.peak, len(self._items))
+            self._cond.notify_all()
+
+    def close(self, error=None):
+        """Producer side: no more items are coming (error says why, if the scrape failed)"""
+        with self._cond:
+            self.closed = True
+            self.error = error
+            self._cond.notify_all()
+
+    def cancel(self):
+        """Consumer side: drop what is waiting and make the next put() raise"""
+        with self._cond:
+            self.cancelled = True
+            self._items.clear()
+            self._cond.notify_all()
+
+    def __iter__(self):
+        while True:
+            with self._cond:
+                if not self._items and not self.closed and not self.cancelled:
+                    with timed("queue_wait"):
+                        while not self._items and not self.closed and not self.cancelled:
+                            self._cond.wait()
+                if self.cancelled or not self._items:
+                    return
+                item = self._items.popleft()
+                self.consumed += 1
+                self._cond.notify_all()
+            yield item
+
+def run_live_migration(source_driver, destination_driver, queue_size=200, scrape_options=None, **migrate_options):
+    """
+    Scrape the source account and migrate into the destination at the same
+    time: the scraper runs in a background thread on source_driver and feeds
+    every new item into a bounded ItemQueue that migrate_youtube_data consumes
+    on destination_driver. If migration stops early, the queue is cancelled
+    and the scraper stops at its next item. Returns the queue (for its counts).
+    """
+    from migrator import migrate_youtube_data
+    from scraper import scrape_youtube_data
+
+    item_queue = ItemQueue(queue_size)
+
+    def produce():
+        try:
+            with timed("scrape"):
+                scrape_youtube_data(source_driver, on_item=item_queue.put, **(scrape_options or {}))
+        except QueueClosed:
+            print("! Scraping stopped: migration is no longer taking items")
+        except Exception as e:
+            print(f"✗ Scraping failed: {e}")
+            item_queue.close(e)
+            return
+        item_queue.close()
+
+    producer = threading.Thread(target=produce, name="scrape-producer", daemon=True)
+    producer.start()
+    try:
+        with timed("migrate"):
+            migrate_youtube_data(destination_driver, item_queue=item_queue, **migrate_options)
+    finally:
+        item_queue.cancel()
+        producer.join(timeout=60)
+        if producer.is_alive():
+            print("! Scraper did not stop within 60s; leaving it to exit with the process")
+
+    print(f"\nHand-off: {item_queue.produced} items scraped, {item_queue.consumed} migrated from the queue, "
+          f"peak {item_queue.peak}/{item_queue.maxsize} waiting")
+    if item_queue.error:
+        print(f"! The scrape ended early ({item_queue.error}); only the items above were migrated")
+    return item_queue
@@ -0,0 +1,115 @@
+import json
+import re
+from utils import channel_id, video_id
+
+# One round trip for the whole blob; stringified in the page so WebDriver
+# doesn't convert the object tree node by node. Only fresh after a full
+# page load (driver.get), not after YouTube's in-app navigation.
+INITIAL_DATA_JS = "return window.ytInitialData ? JSON.stringify(window.ytInitialData) : null;"
+
+# How the blob is assigned in YouTube's page source
+INITIAL_DATA_RE = re.compile(r"""(?:var\s+ytInitialData|window\s*\[\s*["']ytInitialData["']\s*\])\s*=\s*""")
+
+def read_initial_data(driver):
+    """ytInitialData of the current page as a dict, or None if the page has none"""
+    try:
+        raw = driver.execute_script(INITIAL_DATA_JS)
+    except Exception as e:
+        print(f"! Could not read ytInitialData: {e}")
+        return None
+    return json.loads(raw) if raw else None
+
+def initial_data_from_source(page_source):
+    """ytInitialData parsed out of saved page HTML, or None"""
+    match = INITIAL_DATA_RE.search(page_source)
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(page_source, match.end())
+    except json.JSONDecodeError:
+        return None
+    return data
+
+def iter_renderers(node, names):
+    """Yield (name, renderer) for every renderer called one of names anywhere in the tree"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for key, value in current.items():
+                if key in names and isinstance(value, dict):
+                    yield key, value
+                stack.append(value)
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+def _text(value):
+    """Plain text of a {"simpleText": ...} or {"runs": [...]} field"""
+    if not isinstance(value, dict):
+        return ""
+    if "simpleText" in value:
+        return value["simpleText"]
+    return "".join(run.get("text", "") for run in value.get("runs", []))
+
+def _channel_key(renderer):
+    browse = renderer.get("navigationEndpoint", {}).get("browseEndpoint", {})
+    return channel_id(browse.get("canonicalBaseUrl", "")) or channel_id(renderer.get("channelId") or browse.get("browseId", ""))
+
+CHANNEL_RENDERERS = ("channelRenderer", "gridChannelRenderer")
+VIDEO_RENDERERS = ("playlistVideoRenderer", "gridVideoRenderer", "videoRenderer")
+CONTINUATION_RENDERERS = ("continuationItemRenderer",)
+PLAYLIST_RENDERERS = ("gridPlaylistRenderer", "playlistRenderer", "lockupViewModel")
+
+def _playlist_entry(name, renderer):
+    """{"id", "title"} of a playlist tile, or None for lockups that aren't playlists"""
+    if name != "lockupViewModel":
+        return {"id": renderer.get("playlistId"), "title": _text(renderer.get("title"))}
+    if renderer.get("contentType") != "LOCKUP_CONTENT_TYPE_PLAYLIST":
+        return None
+    title = renderer.get("metadata", {}).get("lockupMetadataViewModel", {}).get("title", {})
+    return {"id": renderer.get("contentId"), "title": title.get("content", "")}
+
+def parse_initial_data(data):
+    """
+    Channel keys, video IDs and playlist IDs (with titles) and continuation
+    tokens found in a ytInitialData (or continuation response) tree, in page
+    order. Keys are canonical, so they match what the DOM path would produce.
+    """
+    result = {"channels": [], "videos": [], "playlists": [], "continuations": [], "reported_count": None}
+    if not data:
+        return result
+    seen = set()
+    names = CHANNEL_RENDERERS + VIDEO_RENDERERS + PLAYLIST_RENDERERS + CONTINUATION_RENDERERS
+    for name, renderer in iter_renderers(data, names):
+        if name in CHANNEL_RENDERERS:
+            key = _channel_key(renderer)
+            if key and key not in seen:
+                seen.add(key)
+                result["channels"].append({"id": key, "title": _text(renderer.get("title"))})
+        elif name in VIDEO_RENDERERS:
+            key = video_id(renderer.get("videoId", ""))
+            if key and key not in seen:
+                seen.add(key)
+                result["videos"].append({"id": key, "title": _text(renderer.get("title"))})
+        elif name in PLAYLIST_RENDERERS:
+            entry = _playlist_entry(name, renderer)
+            if entry and entry["id"] and ("list", entry["id"]) not in seen:
+                seen.add(("list", entry["id"]))
+                result["playlists"].append(entry)
+        else:
+            command = renderer.get("continuationEndpoint", {}).get("continuationCommand", {})
+            if command.get("token"):
+                result["continuations"].append(command["token"])
+
+    for _, header in iter_renderers(data, ("playlistHeaderRenderer",)):
+        text = _text(header.get("numVideosText")) or " ".join(_text(stat) for stat in header.get("stats", []))
+        match = re.search(r"\d[\d,.\s]*", text)
+        if match:
+            result["reported_count"] = int(re.sub(r"\D", "", match.group()))
+        break
+    return result
+
+def read_page_items(driver):
+    """Parsed ytInitialData of the current page, or None so callers can fall back to the DOM"""
+    data = read_initial_data(driver)
+    return parse_initial_data(data) if data else None
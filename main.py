@@ -1,70 +1,94 @@
 import sys
 import os
+import time
+from functools import partial
+from importlib import import_module
+from metrics import default_metrics, timed
+from state import StateStore
+
+STARTED_AT = time.perf_counter()
 
 print("=== YouTube Data Migration Tool ===")
 print("Starting application...")
 
-# Test imports first
-try:
-    print("Importing selenium...")
-    from selenium import webdriver
-    print("✓ Selenium imported")
-except ImportError as e:
-    print(f"✗ Failed to import selenium: {e}")
-    print("Please install: pip install selenium")
-    sys.exit(1)
+# Pip package for each third-party module, for the message when one is missing
+INSTALL_HINTS = {
+    "selenium": "selenium",
+    "undetected_chromedriver": "undetected-chromedriver",
+}
+
+def load_phase(module_name, attribute):
+    """Import a module only when the phase that needs it starts"""
+    try:
+        print(f"Importing {module_name} module...")
+        module = import_module(module_name)
+        print(f"✓ {module_name.capitalize()} module imported")
+        return getattr(module, attribute)
+    except ImportError as e:
+        print(f"✗ Failed to import {module_name}: {e}")
+        missing = (getattr(e, "name", None) or "").split(".")[0]
+        if missing in INSTALL_HINTS:
+            print(f"Please install: pip install {INSTALL_HINTS[missing]}")
+        else:
+            print(f"Make sure {module_name}.py is in the same directory")
+        sys.exit(1)
+    except Exception as e:
+        print(f"✗ Error in {module_name}.py: {e}")
+        sys.exit(1)
+
+# --lean blocks images, media, fonts and ad/telemetry hosts; --headless only
+# makes sense with a profile that is already logged in.
+LEAN_MODE = "--lean" in sys.argv
+HEADLESS_MODE = "--headless" in sys.argv
+
+# --incremental only loads Watch Later until it reaches videos the last scrape
+# saw (subscriptions are not newest-first, so they are always loaded in full)
+INCREMENTAL = "--incremental" in sys.argv
 
-try:
-    print("Importing undetected chromedriver...")
-    import undetected_chromedriver as uc
-    print("✓ Undetected chromedriver imported")
-except ImportError as e:
-    print(f"✗ Failed to import undetected_chromedriver: {e}")
-    print("Please install: pip install undetected-chromedriver")
-    sys.exit(1)
+# --live opens a second browser for the new account and migrates each item
+# while the scrape of the old account is still running
+LIVE_MODE = "--live" in sys.argv
 
-try:
-    print("Importing scraper module...")
-    from scraper import scrape_youtube_data
-    print("✓ Scraper module imported")
-except ImportError as e:
-    print(f"✗ Failed to import scraper: {e}")
-    print("Make sure scraper.py is in the same directory")
-    sys.exit(1)
-except Exception as e:
-    print(f"✗ Error in scraper.py: {e}")
-    sys.exit(1)
+# --playlists also migrates every user playlist; --playlist-workers=N shares
+# them between N browsers
+PLAYLISTS_MODE = "--playlists" in sys.argv
 
-try:
-    print("Importing migrator module...")
-    from migratortest import migrate_youtube_data
-    print("✓ Migrator module imported")
-except ImportError as e:
-    print(f"✗ Failed to import migrator: {e}")
-    print("Make sure migrator.py is in the same directory")
-    sys.exit(1)
-except Exception as e:
-    print(f"✗ Error in migrator.py: {e}")
-    sys.exit(1)
+# --tabs=N preloads the next N-1 items in extra tabs while one is handled;
+# --wl-batch=N adds Watch Later videos N at a time (up to 50)
+TAB_DEPTH = 1
+WATCH_LATER_BATCH = 0
+PLAYLIST_WORKERS = 1
 
-def get_driver():
+# --record=PATH writes every WebDriver command and response of the first
+# browser to PATH, for `python replay.py analyze PATH`
+RECORD_PATH = None
+for arg in sys.argv:
+    if arg.startswith("--tabs=") and arg.split("=", 1)[1].isdigit():
+        TAB_DEPTH = max(1, int(arg.split("=", 1)[1]))
+    if arg.startswith("--wl-batch=") and arg.split("=", 1)[1].isdigit():
+        WATCH_LATER_BATCH = int(arg.split("=", 1)[1])
+    if arg.startswith("--playlist-workers=") and arg.split("=", 1)[1].isdigit():
+        PLAYLIST_WORKERS = max(1, int(arg.split("=", 1)[1]))
+    if arg.startswith("--record=") and arg.split("=", 1)[1]:
+        RECORD_PATH = arg.split("=", 1)[1]
+
+# Persistent Chrome profiles so the logins survive between runs
+PROFILE_DIR = os.path.abspath(os.path.join("data", "chrome-profile"))
+DESTINATION_PROFILE_DIR = os.path.abspath(os.path.join("data", "chrome-profile-destination"))
+
+def get_driver(user_data_dir=PROFILE_DIR):
     print("\n=== Setting up Chrome Driver ===")
     try:
-        options = uc.ChromeOptions()
-        
-        # Add some common options to prevent issues
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
+        create_driver = load_phase("browser", "create_driver")
+        health_check = load_phase("browser", "health_check")
         
-        print("Creating Chrome driver...")
-        driver = uc.Chrome(options=options)
-        print("✓ Chrome driver created successfully!")
+        print(f"Creating Chrome driver{' (lean)' if LEAN_MODE else ''}{' (headless)' if HEADLESS_MODE else ''}...")
+        driver = create_driver(user_data_dir=user_data_dir, lean=LEAN_MODE, headless=HEADLESS_MODE)
+        print(f"✓ Chrome driver created successfully! ({time.perf_counter() - STARTED_AT:.1f}s since launch)")
         
-        # Test the driver
-        print("Testing driver...")
-        driver.get("https://www.google.com")
+        # Test the driver locally instead of loading a real site
+        if not health_check(driver):
+            raise RuntimeError("driver did not answer the health check")
         print("✓ Driver test successful!")
         
         return driver
@@ -77,6 +101,37 @@ def get_driver():
         print("3. Check if Chrome is running in the background and close it")
         return None
 
+def live_migration(source_driver, store):
+    """Both accounts at once: scrape in the first browser while the second one migrates"""
+    destination_driver = get_driver(DESTINATION_PROFILE_DIR)
+    if not destination_driver:
+        print("Cannot run live mode without a second browser.")
+        return False
+    default_metrics().track_driver(destination_driver)
+    
+    try:
+        destination_driver.get("https://www.youtube.com")
+        print("\n" + "="*50)
+        print("STEP 2: LOGIN TO YOUR NEW YOUTUBE ACCOUNT")
+        print("="*50)
+        print("Please login to your NEW YouTube account in the second browser window.")
+        input("Press Enter when both browsers are logged in and ready...")
+        
+        print("\n=== Starting Live Scraping and Migration ===")
+        run_live_migration = load_phase("handoff", "run_live_migration")
+        with timed("live"):
+            run_live_migration(
+                source_driver, destination_driver, store=store,
+                scrape_options={"store": store, "stream_path": "data/youtube-data.jsonl", "incremental": INCREMENTAL}
+            )
+        print("✓ Live migration completed!")
+        return True
+    finally:
+        try:
+            destination_driver.quit()
+        except:
+            pass
+
 def main():
     print("\n=== Starting Main Process ===")
     
@@ -86,10 +141,17 @@ def main():
         print("Cannot proceed without a working driver. Exiting.")
         return False
     
+    store = StateStore("data/migration-state.db")
+    default_metrics().track_driver(driver)
+    recorder = None
+    if RECORD_PATH:
+        recorder = load_phase("replay", "SessionRecorder")(driver, RECORD_PATH).start()
+    
     try:
         # Navigate to YouTube to start
         print("\nNavigating to YouTube...")
         driver.get("https://www.youtube.com")
+        print(f"✓ First navigation ready {time.perf_counter() - STARTED_AT:.1f}s after launch")
         
         print("\n" + "="*50)
         print("STEP 1: LOGIN TO YOUR CURRENT YOUTUBE ACCOUNT")
@@ -98,8 +160,17 @@ def main():
         print("Make sure you're fully logged in before proceeding.")
         input("Press Enter when you're logged in and ready to scrape data...")
         
+        if LIVE_MODE:
+            return live_migration(driver, store)
+        
         print("\n=== Starting Data Scraping ===")
-        scrape_youtube_data(driver)
+        scrape_youtube_data = load_phase("scraper", "scrape_youtube_data")
+        with timed("scrape"):
+            scrape_youtube_data(driver, store=store, stream_path="data/youtube-data.jsonl", incremental=INCREMENTAL)
+        if PLAYLISTS_MODE:
+            scrape_playlists = load_phase("playlists", "scrape_playlists")
+            with timed("scrape_playlists"):
+                scrape_playlists(driver)
         print("✓ Data scraping completed!")
         
         print("\n" + "="*50)
@@ -110,7 +181,20 @@ def main():
         input("Press Enter when you're logged in and ready to migrate data...")
         
         print("\n=== Starting Data Migration ===")
-        migrate_youtube_data(driver)
+        migrate_youtube_data = load_phase("migrator", "migrate_youtube_data")
+        create_driver = load_phase("browser", "create_driver")
+        with timed("migrate"):
+            migrate_youtube_data(
+                driver, driver_factory=partial(create_driver, lean=LEAN_MODE, headless=HEADLESS_MODE), store=store,
+                stream_path="data/youtube-data.jsonl", tab_depth=TAB_DEPTH, watch_later_batch=WATCH_LATER_BATCH
+            )
+        if PLAYLISTS_MODE:
+            migrate_playlists = load_phase("playlists", "migrate_playlists")
+            with timed("migrate_playlists"):
+                migrate_playlists(
+                    driver, store=store, batch_size=WATCH_LATER_BATCH, workers=PLAYLIST_WORKERS,
+                    driver_factory=partial(create_driver, lean=LEAN_MODE, headless=HEADLESS_MODE)
+                )
         print("✓ Data migration completed!")
         
         return True
@@ -125,6 +209,11 @@ def main():
         return False
     finally:
         print("\n=== Cleaning Up ===")
+        store.close()
+        if recorder:
+            recorder.stop()
+        metrics = default_metrics()
+        print(f"✓ Run report written to {metrics.write_report()} (Prometheus: {metrics.write_prometheus()})")
         try:
             driver.quit()
             print("✓ Browser closed")
@@ -134,7 +223,6 @@ def main():
 if __name__ == "__main__":
     print(f"Python version: {sys.version}")
     print(f"Working directory: {os.getcwd()}")
-    print(f"Files in directory: {os.listdir('.')}")
     
     success = main()
     
@@ -0,0 +1,180 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Upper bounds (seconds) of the Prometheus histogram buckets for every phase
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+def percentile(values, fraction):
+    """Nearest-rank percentile, or None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class RunMetrics:
+    """
+    Per-phase timings (navigate, ready, locate, click, confirm, rate-limit
+    sleep, ...) and WebDriver command counts for one run. Phases timed inside
+    item() are also attributed to that item. Thread-safe, so pool workers
+    share one instance; each worker thread has its own current item.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._tracked = set()
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.durations = {}
+        self.commands = Counter()
+        self.items = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.durations.setdefault(name, []).append(seconds)
+        item = getattr(self._local, "item", None)
+        if item is not None:
+            item["phases"][name] = item["phases"].get(name, 0.0) + seconds
+
+    @contextmanager
+    def item(self, section, key):
+        """Attribute phases and commands in this thread to one item; set the yielded dict's status"""
+        record = {"section": section, "item": key, "status": None, "phases": {}, "commands": 0}
+        self._local.item = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._local.item = None
+            with self._lock:
+                self.items.append(record)
+            self.observe("item", record["seconds"])
+
+    def current_item(self):
+        """The record of the item this thread is handling, or None between items"""
+        return getattr(self._local, "item", None)
+
+    def track_driver(self, driver):
+        """Count every WebDriver command the driver sends for the rest of the run"""
+        executor = driver.command_executor
+        with self._lock:
+            if id(executor) in self._tracked:
+                return
+            self._tracked.add(id(executor))
+        original_execute = executor.execute
+
+        def counting_execute(command, params):
+            with self._lock:
+                self.commands[command] += 1
+            item = getattr(self._local, "item", None)
+            if item is not None:
+                item["commands"] += 1
+            return original_execute(command, params)
+
+        executor.execute = counting_execute
+
+    def summary(self):
+        with self._lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+            items = list(self.items)
+            commands = dict(self.commands)
+        phases = {
+            name: {
+                "count": len(values),
+                "total_seconds": sum(values),
+                "mean_seconds": sum(values) / len(values),
+                "p50_seconds": percentile(values, 0.5),
+                "p95_seconds": percentile(values, 0.95),
+                "max_seconds": max(values),
+            }
+            for name, values in durations.items()
+        }
+        by_status = Counter(f"{record['section']}:{record['status']}" for record in items)
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "wall_seconds": time.perf_counter() - self._start,
+            "phases": phases,
+            "commands": commands,
+            "commands_total": sum(commands.values()),
+            "items": {"count": len(items), "by_status": dict(by_status), "records": items},
+        }
+
+    def write_report(self, path="data/run-report.json"):
+        """JSON run report: phase statistics, command counts and one record per item"""
+        _write_atomic(path, json.dumps(self.summary(), indent=4))
+        return path
+
+    def write_prometheus(self, path="data/metrics.prom"):
+        """Prometheus textfile-collector output with one histogram per phase"""
+        with self._lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+            commands = dict(self.commands)
+            items = Counter((record["section"], record["status"]) for record in self.items)
+
+        lines = [
+            "# HELP ytm_phase_seconds Time spent per phase of the migration tool.",
+            "# TYPE ytm_phase_seconds histogram",
+        ]
+        for name, values in sorted(durations.items()):
+            for bound in HISTOGRAM_BUCKETS:
+                lines.append(f'ytm_phase_seconds_bucket{{phase="{name}",le="{bound}"}} {sum(1 for v in values if v <= bound)}')
+            lines.append(f'ytm_phase_seconds_bucket{{phase="{name}",le="+Inf"}} {len(values)}')
+            lines.append(f'ytm_phase_seconds_sum{{phase="{name}"}} {sum(values):.6f}')
+            lines.append(f'ytm_phase_seconds_count{{phase="{name}"}} {len(values)}')
+
+        lines += [
+            "# HELP ytm_webdriver_commands_total WebDriver commands sent, by command.",
+            "# TYPE ytm_webdriver_commands_total counter",
+        ]
+        for command, count in sorted(commands.items()):
+            lines.append(f'ytm_webdriver_commands_total{{command="{command}"}} {count}')
+
+        lines += [
+            "# HELP ytm_items_total Items processed, by section and final status.",
+            "# TYPE ytm_items_total counter",
+        ]
+        for (section, status), count in sorted(items.items(), key=lambda entry: tuple(map(str, entry[0]))):
+            lines.append(f'ytm_items_total{{section="{section}",status="{status}"}} {count}')
+
+        _write_atomic(path, "\n".join(lines) + "\n")
+        return path
+
+def _write_atomic(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+_default_metrics = None
+
+def default_metrics():
+    """Metrics shared by every module within one process"""
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = RunMetrics()
+    return _default_metrics
+
+def set_default_metrics(metrics):
+    global _default_metrics
+    _default_metrics = metrics
+
+def timed(name):
+    """Time a block as phase name in the shared metrics"""
+    return default_metrics().phase(name)
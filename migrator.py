@@ -1,266 +1,457 @@
 import json 
 import time 
-import random
-from selenium.webdriver.common.by import By
+from functools import partial
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from ratelimit import AIMDRateController, Unpaced
+from batching import add_videos_in_batches, option_checked
+from metrics import default_metrics, timed
+from planner import plan_migration, scrape_destination, verify_migration
+from readiness import detect_interstitial, navigate, wait_until_ready
+from retry import ERROR, MISSING_ELEMENT, NOT_CONFIRMED, THROTTLED, RetryScheduler, classify_exception
+from selector_registry import default_registry, probe
+from snapshots import capture_snapshot, diagnose_snapshot
+from streaming import open_jsonl_export
+from tab_pipeline import run_tab_pipeline
+from state import ALREADY_PRESENT, DONE, FAILED, SKIPPED, SUCCESS_STATUSES, UNCONFIRMED
+from utils import DATA_KINDS, YOUTUBE_URL, ItemSet, canonical_key, canonical_url, load_youtube_data
+from worker_pool import run_worker_pool, start_worker_drivers, stop_worker_drivers
 
-def debug_page_elements(driver, page_type="channel"):
-    """Debug function to see what elements are actually on the page"""
-    print(f"\n=== DEBUGGING {page_type.upper()} PAGE ===")
-    print(f"Current URL: {driver.current_url}")
-    
-    if page_type == "channel":
-        # Look for subscribe-related elements
-        selectors_to_test = [
-            ('xpath', '//ytd-subscribe-button-renderer'),
-            ('xpath', '//button[contains(@aria-label, "Subscribe")]'),
-            ('xpath', '//button[contains(text(), "Subscribe")]'),
-            ('css', 'ytd-subscribe-button-renderer button'),
-            ('xpath', '//tp-yt-paper-button[contains(@aria-label, "Subscribe")]'),
-            ('xpath', '//yt-button-shape[contains(@aria-label, "Subscribe")]'),
-            ('css', '#subscribe-button'),
-        ]
-    else:  # video page
-        selectors_to_test = [
-            ('xpath', '//button[@aria-label="Save to Watch later"]'),
-            ('xpath', '//button[contains(@aria-label, "Save")]'),
-            ('css', '#top-level-buttons ytd-menu-renderer button'),
-            ('xpath', '//ytd-menu-renderer//button[contains(@aria-label, "Save")]'),
-        ]
-    
-    print("Testing selectors:")
-    found_elements = []
-    
-    for selector_type, selector in selectors_to_test:
-        try:
-            if selector_type == "xpath":
-                elements = driver.find_elements(By.XPATH, selector)
-            else:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            
-            print(f"  {selector}: Found {len(elements)} elements")
-            
-            if elements:
-                for i, elem in enumerate(elements[:3]):  # Show first 3
-                    try:
-                        text = elem.text.strip()
-                        aria_label = elem.get_attribute('aria-label') or ''
-                        title = elem.get_attribute('title') or ''
-                        print(f"    Element {i+1}: text='{text}', aria-label='{aria_label}', title='{title}'")
-                        found_elements.append({
-                            'element': elem,
-                            'selector': selector,
-                            'text': text,
-                            'aria_label': aria_label,
-                            'title': title
-                        })
-                    except Exception as e:
-                        print(f"    Element {i+1}: Error reading - {e}")
-        except Exception as e:
-            print(f"  {selector}: Error - {e}")
-    
-    return found_elements
+# True once the channel page shows the subscribed state after our click
+SUBSCRIBED_STATE_JS = """
+const renderer = document.querySelector('ytd-subscribe-button-renderer');
+if (renderer && renderer.hasAttribute('subscribed')) return true;
+for (const button of document.querySelectorAll('ytd-subscribe-button-renderer button, #subscribe-button button')) {
+    const label = ((button.getAttribute('aria-label') || '') + ' ' + (button.innerText || '')).toLowerCase();
+    if (label.includes('subscribed') || label.includes('unsubscribe')) return true;
+}
+return false;
+"""
+
+def confirm_subscribed(driver, timeout=3):
+    """Wait briefly for the subscribe button to flip; an unchanged state is a throttling sign"""
+    try:
+        with timed("confirm"):
+            WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+                lambda d: d.execute_script(SUBSCRIBED_STATE_JS)
+            )
+        return True
+    except TimeoutException:
+        return False
+
+def _open(driver, url, page_type, preloaded=False):
+    """Navigate to url, or, when a tab pipeline already requested it, just wait for it"""
+    if preloaded:
+        with timed("ready"):
+            return wait_until_ready(driver, page_type)
+    return navigate(driver, url, page_type)
+
+def _click(element):
+    with timed("click"):
+        element.click()
+
+def _is_subscribed(found):
+    """Whether a probed subscribe button already shows the subscribed state"""
+    return 'subscribed' in found['text'].lower() or 'subscribed' in found['aria_label'].lower()
+
+def _describe(found):
+    return f"found '{found['text'] or found['aria_label']}' via selector {found['selector']} in {found['ms']:.0f} ms"
+
+def debug_snapshot(driver, url, page_type, reason, diagnose=True):
+    """Capture the page once to disk and, optionally, run the selector report offline against it"""
+    try:
+        with timed("snapshot"):
+            path = capture_snapshot(driver, url, page_type, reason)
+    except Exception as e:
+        print(f"! Could not capture snapshot for {url}: {e}")
+        return None
+    print(f"  Snapshot saved: {path}")
+    if diagnose:
+        diagnose_snapshot(path, page_type)
+    return path
 
 def interactive_subscribe(driver, channel_url):
-    """Interactive subscription with manual fallback"""
+    """Interactive subscription with manual fallback; returns (status, error class or None)"""
     print(f"\n=== SUBSCRIBING TO: {channel_url} ===")
     
     try:
-        driver.get(channel_url)
-        time.sleep(3)
+        navigate(driver, channel_url, "channel")
         
-        # Debug what's on the page
-        found_elements = debug_page_elements(driver, "channel")
+        # Try automatic subscription first: all selectors probed at once
+        found = probe(driver, "subscribe", timeout=5, required=["subscribe"])
         
-        # Try automatic subscription first
-        subscribe_selectors = [
-            ('xpath', '//ytd-subscribe-button-renderer//button[contains(@aria-label, "Subscribe")]'),
-            ('xpath', '//button[contains(@aria-label, "Subscribe")]'),
-            ('xpath', '//button[contains(text(), "Subscribe")]'),
-            ('css', 'ytd-subscribe-button-renderer button'),
-            ('xpath', '//tp-yt-paper-button[contains(@aria-label, "Subscribe")]'),
-            ('xpath', '//yt-button-shape//button'),
-        ]
+        if found:
+            print(f"  {_describe(found)}")
+            if _is_subscribed(found):
+                print(f"- Already subscribed to this channel")
+                return ALREADY_PRESENT, None
+            _click(found['element'])
+            if not confirm_subscribed(driver):
+                print(f"✗ Clicked subscribe but the button state did not change")
+                return FAILED, NOT_CONFIRMED
+            print(f"✓ Successfully clicked subscribe button!")
+            return DONE, None
         
-        for selector_type, selector in subscribe_selectors:
-            try:
-                if selector_type == "xpath":
-                    element = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                else:
-                    element = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                
-                # Check if it's actually a subscribe button
-                text = element.text.strip().lower()
-                aria_label = element.get_attribute('aria-label', '').lower()
-                
-                if 'subscribe' in text or 'subscribe' in aria_label:
-                    if 'subscribed' not in text and 'subscribed' not in aria_label:
-                        element.click()
-                        print(f"✓ Successfully clicked subscribe button!")
-                        time.sleep(random.uniform(2, 4))
-                        return True
-                    else:
-                        print(f"- Already subscribed to this channel")
-                        return True
-                        
-            except TimeoutException:
-                continue
-            except Exception as e:
-                print(f"Error with selector {selector}: {e}")
-                continue
-        
-        # If automatic failed, provide manual option
+        # If automatic failed, show what's on the page, then provide manual option
+        debug_snapshot(driver, channel_url, "channel", "interactive-failed")
         print("\n❌ Automatic subscription failed!")
         print("Please manually subscribe to this channel in the browser.")
         print("The browser should be showing the channel page.")
         input("Press Enter after you've subscribed (or Enter to skip)...")
-        return True
+        return SKIPPED, None
         
     except Exception as e:
         print(f"Error loading channel: {e}")
-        return False
+        return FAILED, classify_exception(e)
 
 def interactive_watch_later(driver, video_url):
-    """Interactive watch later with manual fallback"""
+    """Interactive watch later with manual fallback; returns (status, error class or None)"""
     print(f"\n=== ADDING TO WATCH LATER: {video_url} ===")
     
     try:
-        driver.get(video_url)
-        time.sleep(3)
+        navigate(driver, video_url, "video")
         
-        # Debug what's on the page
-        found_elements = debug_page_elements(driver, "video")
+        # Try automatic save to watch later: all selectors probed at once
+        found = probe(driver, "save", timeout=5, required=["save", "watch later"])
         
-        # Try automatic save to watch later
-        save_selectors = [
-            ('xpath', '//button[@title="Save to Watch later"]'),
-            ('xpath', '//button[@aria-label="Save to Watch later"]'),
-            ('xpath', '//button[contains(@aria-label, "Save")]'),
-            ('css', '#top-level-buttons ytd-menu-renderer button'),
-            ('xpath', '//ytd-menu-renderer//button'),
-        ]
-        
-        for selector_type, selector in save_selectors:
+        if found:
+            print(f"  {_describe(found)}")
+            _click(found['element'])
+            
+            # Look for Watch Later option in the menu
             try:
-                if selector_type == "xpath":
-                    element = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                else:
-                    element = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
+                wl_found = probe(driver, "watch-later-option", timeout=3)
+                if wl_found:
+                    print(f"  {_describe(wl_found)}")
+                    # A ticked option means it is already saved; clicking would remove it
+                    if option_checked(driver, wl_found):
+                        print(f"- Already in Watch Later")
+                        return ALREADY_PRESENT, None
+                    _click(wl_found['element'])
+                    print(f"✓ Successfully added to Watch Later!")
+                    return DONE, None
                 
-                aria_label = element.get_attribute('aria-label', '').lower()
-                title = element.get_attribute('title', '').lower()
+                # If we can't find Watch Later specifically, the save might have worked
+                print(f"~ Clicked save button (Watch Later option not found)")
+                return UNCONFIRMED, None
                 
-                if 'save' in aria_label or 'save' in title or 'watch later' in aria_label:
-                    element.click()
-                    time.sleep(2)
-                    
-                    # Look for Watch Later option in the menu
-                    try:
-                        wl_selectors = [
-                            ('xpath', '//yt-formatted-string[text()="Watch later"]'),
-                            ('xpath', '//span[text()="Watch later"]'),
-                            ('xpath', '//ytd-playlist-add-to-button-renderer//span[contains(text(), "Watch later")]'),
-                        ]
-                        
-                        for wl_sel_type, wl_selector in wl_selectors:
-                            try:
-                                if wl_sel_type == "xpath":
-                                    wl_element = WebDriverWait(driver, 3).until(
-                                        EC.element_to_be_clickable((By.XPATH, wl_selector))
-                                    )
-                                else:
-                                    wl_element = WebDriverWait(driver, 3).until(
-                                        EC.element_to_be_clickable((By.CSS_SELECTOR, wl_selector))
-                                    )
-                                
-                                wl_element.click()
-                                print(f"✓ Successfully added to Watch Later!")
-                                time.sleep(random.uniform(2, 4))
-                                return True
-                            except TimeoutException:
-                                continue
-                        
-                        # If we can't find Watch Later specifically, the save might have worked
-                        print(f"~ Clicked save button (Watch Later option not found)")
-                        return True
-                        
-                    except Exception as e:
-                        print(f"Error finding Watch Later option: {e}")
-                        return True  # Assume it worked
-                        
-            except TimeoutException:
-                continue
             except Exception as e:
-                print(f"Error with selector {selector}: {e}")
-                continue
+                print(f"Error finding Watch Later option: {e}")
+                return UNCONFIRMED, None  # Probably worked; re-verify later
         
-        # If automatic failed, provide manual option
+        # If automatic failed, show what's on the page, then provide manual option
+        debug_snapshot(driver, video_url, "video", "interactive-failed")
         print("\n❌ Automatic save to Watch Later failed!")
         print("Please manually add this video to Watch Later in the browser.")
         print("Look for the 'Save' button under the video.")
         input("Press Enter after you've saved it (or Enter to skip)...")
-        return True
+        return SKIPPED, None
         
     except Exception as e:
         print(f"Error loading video: {e}")
-        return False
+        return FAILED, classify_exception(e)
 
-def migrate_youtube_data(driver):
-    """Enhanced migration with debugging and manual fallbacks"""
+def migrate_youtube_data(driver, workers=None, driver_factory=None, max_per_minute=30, store=None,
+                         rate_controller=None, plan=None, stream_path=None, mode=None, base_url=YOUTUBE_URL,
+                         data_path="data/youtube-data.json", tab_depth=1, watch_later_batch=0, item_queue=None,
+                         retries=None):
+    """
+    Enhanced migration with debugging and manual fallbacks. Items come from
+    data_path, stream_path or a live item_queue; a store makes reruns resume.
+    workers, tab_depth and watch_later_batch choose how items are driven, and
+    failures are retried later in the run unless retries is False.
+    """
     try:
-        with open("data/youtube-data.json", "r") as f:
-            data = json.load(f)
+        if item_queue is not None:
+            item_sets = {}
+        elif stream_path:
+            item_sets = open_jsonl_export(stream_path)
+        else:
+            item_sets = load_youtube_data(data_path)
     except FileNotFoundError:
-        print("Error: youtube-data.json not found. Please run scraper first.")
-        return
+        if store is None:
+            print(f"Error: {stream_path or data_path} not found. Please run scraper first.")
+            return
+        item_sets = {}
     except json.JSONDecodeError:
         print("Error: Invalid JSON file.")
         return
     
-    print(f"Starting migration of {len(data.get('subscriptions', []))} subscriptions and {len(data.get('watch_later', []))} watch later videos")
+    if plan is None:
+        plan = input("Scrape the destination account first and skip items it already has? (y/n): ").strip().lower() == 'y'
+    source_sets = item_sets
+    present = None
+    if plan and item_queue is not None:
+        present = scrape_destination(driver, base_url)
+    elif plan:
+        item_sets, present = plan_migration(driver, source_sets, base_url)
+        if store is not None:
+            for name, items in present.items():
+                store.add_items(name, items)
+                for key in items:
+                    store.mark(name, key, ALREADY_PRESENT)
     
-    # Ask user preference for debugging
-    print("\nDebugging options:")
-    print("1. Full auto (attempt automatic with minimal output)")
-    print("2. Debug mode (show all element detection)")
-    print("3. Interactive mode (manual fallback for each item)")
+    if item_queue is not None:
+        data = {}
+    elif store is not None:
+        for name, items in item_sets.items():
+            store.add_items(name, items)
+        data = {
+            name: [canonical_url(key, kind, base_url) for key in store.unfinished(name)]
+            for name, kind in DATA_KINDS.items()
+        }
+        for name in DATA_KINDS:
+            finished = sum(count for status, count in store.counts(name).items() if status in SUCCESS_STATUSES)
+            if finished:
+                print(f"Resuming {name}: {finished} already finished, {len(data[name])} left")
+    else:
+        data = {name: items.urls(base_url) for name, items in item_sets.items()}
     
-    mode = input("Choose mode (1/2/3): ").strip()
+    if item_queue is not None:
+        print("Starting live migration: items are migrated as the scraper finds them")
+    else:
+        print(f"Starting migration of {len(data.get('subscriptions', []))} subscriptions and {len(data.get('watch_later', []))} watch later videos")
+    
+    # Ask user preference for debugging
+    if mode is None:
+        print("\nDebugging options:")
+        print("1. Full auto (attempt automatic with minimal output)")
+        print("2. Debug mode (show all element detection)")
+        print("3. Interactive mode (manual fallback for each item)")
+        
+        mode = input("Choose mode (1/2/3): ").strip()
     
     debug_mode = mode == "2"
     interactive_mode = mode == "3"
     
-    # Subscribe to channels
-    successful_subs = 0
-    failed_subs = 0
+    if workers is None and driver_factory is not None and not interactive_mode:
+        answer = input("Parallel browser workers (Enter for 1): ").strip()
+        workers = int(answer) if answer.isdigit() and int(answer) > 0 else 1
+    workers = workers or 1
+    if workers > 1 and (interactive_mode or driver_factory is None or item_queue is not None):
+        print("Parallel mode needs non-interactive mode, a driver factory and a finished scrape; running with one browser.")
+        workers = 1
     
-    print(f"\n=== PROCESSING SUBSCRIPTIONS ===")
+    drivers = [driver]
+    if workers > 1:
+        drivers = start_worker_drivers(driver, workers, driver_factory, base_url)
+    for worker_driver in drivers:
+        default_metrics().track_driver(worker_driver)
     
-    for i, channel in enumerate(data.get("subscriptions", []), 1):
-        print(f"\nProcessing subscription {i}/{len(data['subscriptions'])}: {channel}")
-        
-        if interactive_mode:
-            success = interactive_subscribe(driver, channel)
+    rate = rate_controller or AIMDRateController(max_rate=max_per_minute, history_path="data/rate-history.csv")
+    if retries is None and not interactive_mode:
+        retries = RetryScheduler()
+    elif retries is False:
+        retries = None
+    
+    try:
+        if item_queue is not None:
+            successful_subs, failed_subs, successful_wl, failed_wl, source_sets = _consume_queue(
+                driver, item_queue, debug_mode, interactive_mode, rate, store, confirm=not plan, base_url=base_url,
+                present=present, retries=retries
+            )
         else:
-            success = subscribe_to_channel(driver, channel, debug_mode)
+            successful_subs, failed_subs, successful_wl, failed_wl = _process_items(
+                drivers, data, debug_mode, interactive_mode, rate, store, confirm=not plan, tab_depth=tab_depth,
+                watch_later_batch=watch_later_batch, base_url=base_url, retries=retries
+            )
+    finally:
+        stop_worker_drivers(drivers[1:])
+        default_registry().save()
+    
+    print(f"\nMigration completed!")
+    print(f"Total successful operations: {successful_subs + successful_wl}")
+    print(f"Total failed operations: {failed_subs + failed_wl}")
+    if retries is not None:
+        retries.report()
+    
+    if plan:
+        still_missing = verify_migration(driver, source_sets, base_url)
+        if store is not None:
+            for name, items in still_missing.items():
+                for key in items:
+                    store.mark(name, key, FAILED, "missing after verification")
+
+def _record(store, rate, driver, name, url, status, error=None):
+    """Report the outcome to the rate controller and the store; returns whether the page shows throttling"""
+    throttled = detect_interstitial(driver) is not None
+    if throttled:
+        print(f"! Throttling interstitial detected, slowing down")
+    rate.record(status, throttled)
+    if store is not None:
+        store.mark(name, canonical_key(url, DATA_KINDS.get(name, "video")), status, error)
+    return throttled
+
+def migrate_item(driver, name, url, debug_mode, interactive_mode, rate, store=None, confirm=True, preloaded=False,
+                 retries=None, playlist_name=None):
+    """
+    Wait for the rate controller, subscribe to one channel or save one video
+    (name picks which; with playlist_name, the video goes to that playlist),
+    then record the outcome, all within the item's metrics record. Failures
+    are handed to the retry scheduler, if there is one, under their error
+    class; unconfirmed results go to its unconfirmed bucket.
+    """
+    with default_metrics().item(name, url) as item:
+        with timed("rate_limit_sleep"):
+            rate.acquire()
+        if name == "subscriptions" and interactive_mode:
+            status, error = interactive_subscribe(driver, url)
+        elif name == "subscriptions":
+            status, error = subscribe_to_channel(driver, url, debug_mode, confirm, preloaded)
+        elif playlist_name is not None:
+            status, error = save_to_playlist(driver, url, playlist_name, debug_mode, preloaded)
+        elif interactive_mode:
+            status, error = interactive_watch_later(driver, url)
+        else:
+            status, error = add_to_watch_later(driver, url, debug_mode, preloaded)
+        item["status"] = status
+        item["error"] = error
+        if _record(store, rate, driver, name, url, status, error) and status == FAILED:
+            error = THROTTLED
+        if retries is not None and status == FAILED:
+            retries.failed(name, url, error or ERROR, playlist_name)
+        elif retries is not None and status == UNCONFIRMED:
+            retries.unconfirmed(name, url, playlist_name)
+    return status
+
+def run_retries(driver, retries, handle, name=None, wait=False):
+    """
+    Retry the items (of section name, or all) whose backoff has passed, with
+    handle(driver, name, url). With wait, sleep until no retry is left.
+    Returns how many items each section recovered.
+    """
+    recovered = {section: 0 for section in DATA_KINDS}
+    if retries is None:
+        return recovered
+    while True:
+        for section, url, error in retries.take_due(name):
+            print(f"\nRetrying {url} (attempt {retries.attempts(section, url) + 1}, last failed with {error})")
+            if handle(driver, section, url) in SUCCESS_STATUSES:
+                recovered[section] = recovered.get(section, 0) + 1
+        delay = retries.next_due_in(name) if wait else None
+        if delay is None:
+            return recovered
+        if delay > 0:
+            print(f"\nWaiting {delay:.0f}s for the next retry ({len(retries)} pending)...")
+            with timed("retry_backoff"):
+                time.sleep(delay)
+
+def _consume_queue(driver, item_queue, debug_mode, interactive_mode, rate, store=None, confirm=True,
+                   base_url=YOUTUBE_URL, present=None, retries=None):
+    """
+    Migrate items in the order the scraper hands them over. Items the store
+    already finished in an earlier run, or that the destination already has
+    (present), are not visited. Returns the four summary counts plus an
+    ItemSet per section of everything received, for verification.
+    """
+    labels = {"subscriptions": "subscription", "watch_later": "watch later"}
+    handle = partial(
+        migrate_item, debug_mode=debug_mode, interactive_mode=interactive_mode, rate=rate, store=store,
+        confirm=confirm, retries=retries
+    )
+    successful = {name: 0 for name in DATA_KINDS}
+    failed = {name: 0 for name in DATA_KINDS}
+    received = {name: ItemSet(kind) for name, kind in DATA_KINDS.items()}
+    finished_earlier = 0
+    
+    for name, key in item_queue:
+        if not received[name].add(key):
+            continue
+        if store is not None:
+            store.add_items(name, [key])
+            if store.status(name, key) in SUCCESS_STATUSES:
+                finished_earlier += 1
+                continue
+        url = canonical_url(key, DATA_KINDS[name], base_url)
+        if present is not None and key in present[name]:
+            print(f"- {url} is already in the destination")
+            if store is not None:
+                store.mark(name, key, ALREADY_PRESENT)
+            successful[name] += 1
+            continue
+        
+        print(f"\nProcessing {labels[name]} {len(received[name])}: {url} ({len(item_queue)} waiting)")
+        
+        status = handle(driver, name, url)
         
-        if success:
-            successful_subs += 1
+        if status in SUCCESS_STATUSES:
+            successful[name] += 1
         else:
-            failed_subs += 1
+            failed[name] += 1
         
-        # Rate limiting with randomization
-        time.sleep(random.uniform(3, 6))
+        for section, count in run_retries(driver, retries, handle).items():
+            successful[section] += count
+            failed[section] -= count
+    
+    for section, count in run_retries(driver, retries, handle, wait=True).items():
+        successful[section] += count
+        failed[section] -= count
+    
+    if finished_earlier:
+        print(f"\n{finished_earlier} items were already finished in an earlier run")
+    for name, title in (("subscriptions", "Subscription"), ("watch_later", "Watch Later")):
+        print(f"\n{title} Summary:")
+        print(f"Successful: {successful[name]}")
+        print(f"Failed: {failed[name]}")
+        print(f"Total: {len(received[name])}")
+    
+    return successful["subscriptions"], failed["subscriptions"], successful["watch_later"], failed["watch_later"], received
+
+def _process_items(drivers, data, debug_mode, interactive_mode, rate, store=None, confirm=True, tab_depth=1,
+                   watch_later_batch=0, base_url=YOUTUBE_URL, retries=None):
+    """Run both migration phases on one driver (optionally pipelined across tabs), or across the worker pool"""
+    driver = drivers[0]
+    pooled = len(drivers) > 1
+    pipelined = not pooled and not interactive_mode and tab_depth > 1
+    
+    handle = partial(
+        migrate_item, debug_mode=debug_mode, interactive_mode=interactive_mode, rate=rate, store=store,
+        confirm=confirm, retries=retries
+    )
+    
+    def run_subscription(worker_driver, channel, preloaded=False):
+        return handle(worker_driver, "subscriptions", channel, preloaded=preloaded)
+    
+    def run_watch_later(worker_driver, video, preloaded=False):
+        return handle(worker_driver, "watch_later", video, preloaded=preloaded)
+    
+    # Subscribe to channels
+    successful_subs = 0
+    failed_subs = 0
+    
+    print(f"\n=== PROCESSING SUBSCRIPTIONS ===")
+    
+    if pooled:
+        successful_subs, failed_subs, _ = run_worker_pool(
+            drivers, data.get("subscriptions", []),
+            run_subscription, Unpaced(), "subscription"
+        )
+    elif pipelined:
+        statuses = run_tab_pipeline(
+            driver, data.get("subscriptions", []),
+            run_subscription,
+            Unpaced(), "subscription", tab_depth
+        )
+        successful_subs = sum(1 for status in statuses if status in SUCCESS_STATUSES)
+        failed_subs = len(statuses) - successful_subs
+    else:
+        for i, channel in enumerate(data.get("subscriptions", []), 1):
+            print(f"\nProcessing subscription {i}/{len(data['subscriptions'])}: {channel}")
+            
+            status = run_subscription(driver, channel)
+            
+            if status in SUCCESS_STATUSES:
+                successful_subs += 1
+            else:
+                failed_subs += 1
+            
+            recovered = run_retries(driver, retries, handle, "subscriptions")["subscriptions"]
+            successful_subs += recovered
+            failed_subs -= recovered
+    
+    recovered = run_retries(driver, retries, handle, "subscriptions", wait=True)["subscriptions"]
+    successful_subs += recovered
+    failed_subs -= recovered
     
     print(f"\nSubscription Summary:")
     print(f"Successful: {successful_subs}")
@@ -273,114 +464,154 @@ def migrate_youtube_data(driver):
     
     print(f"\n=== PROCESSING WATCH LATER VIDEOS ===")
     
-    for i, video in enumerate(data.get("watch_later", []), 1):
-        print(f"\nProcessing watch later {i}/{len(data['watch_later'])}: {video}")
-        
-        if interactive_mode:
-            success = interactive_watch_later(driver, video)
-        else:
-            success = add_to_watch_later(driver, video, debug_mode)
-        
-        if success:
+    watch_later = data.get("watch_later", [])
+    if watch_later_batch > 1 and not interactive_mode:
+        def record_batched(video, status):
+            nonlocal successful_wl
             successful_wl += 1
-        else:
-            failed_wl += 1
+            if store is not None:
+                store.mark("watch_later", canonical_key(video, "video"), status)
         
-        # Rate limiting with randomization
-        time.sleep(random.uniform(3, 6))
+        watch_later = add_videos_in_batches(
+            driver, watch_later, rate, base_url, watch_later_batch, debug=debug_mode, on_result=record_batched
+        )
+    
+    if pooled:
+        successful, failed_wl, _ = run_worker_pool(
+            drivers, watch_later,
+            run_watch_later, Unpaced(), "watch later"
+        )
+        successful_wl += successful
+    elif pipelined:
+        statuses = run_tab_pipeline(
+            driver, watch_later,
+            run_watch_later,
+            Unpaced(), "watch later", tab_depth
+        )
+        successful = sum(1 for status in statuses if status in SUCCESS_STATUSES)
+        successful_wl += successful
+        failed_wl = len(statuses) - successful
+    else:
+        for i, video in enumerate(watch_later, 1):
+            print(f"\nProcessing watch later {i}/{len(watch_later)}: {video}")
+            
+            status = run_watch_later(driver, video)
+            
+            if status in SUCCESS_STATUSES:
+                successful_wl += 1
+            else:
+                failed_wl += 1
+            
+            recovered = run_retries(driver, retries, handle, "watch_later")["watch_later"]
+            successful_wl += recovered
+            failed_wl -= recovered
+    
+    recovered = run_retries(driver, retries, handle, "watch_later", wait=True)["watch_later"]
+    successful_wl += recovered
+    failed_wl -= recovered
     
     print(f"\nWatch Later Summary:")
     print(f"Successful: {successful_wl}")
     print(f"Failed: {failed_wl}")
     print(f"Total: {len(data.get('watch_later', []))}")
     
-    print(f"\nMigration completed!")
-    print(f"Total successful operations: {successful_subs + successful_wl}")
-    print(f"Total failed operations: {failed_subs + failed_wl}")
+    return successful_subs, failed_subs, successful_wl, failed_wl
 
-def subscribe_to_channel(driver, channel_url, debug=False):
-    """Original subscription logic with optional debugging"""
+def subscribe_to_channel(driver, channel_url, debug=False, confirm=True, preloaded=False):
+    """
+    Original subscription logic with optional debugging; confirm=False leaves
+    checking to a bulk verification pass. Returns (status, error class or None).
+    """
     try:
-        driver.get(channel_url)
-        time.sleep(3)
+        _open(driver, channel_url, "channel", preloaded)
         
         if debug:
-            debug_page_elements(driver, "channel")
-        
-        # Your original logic here, simplified
-        subscribe_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, 
-                '//ytd-subscribe-button-renderer//tp-yt-paper-button | //button[contains(@aria-label, "Subscribe")]'))
-        )
+            debug_snapshot(driver, channel_url, "channel", "debug")
         
-        button_text = subscribe_button.text.strip().lower()
-        aria_label = subscribe_button.get_attribute('aria-label', '').lower()
+        # All subscribe selectors probed at once in the page
+        found = probe(driver, "subscribe", timeout=10, required=["subscribe"])
         
-        if 'subscribe' in button_text or 'subscribe' in aria_label:
-            if 'subscribed' not in button_text and 'subscribed' not in aria_label:
-                subscribe_button.click()
+        if found:
+            if debug:
+                print(f"  {_describe(found)}")
+            if not _is_subscribed(found):
+                _click(found['element'])
+                if confirm and not confirm_subscribed(driver):
+                    print(f"✗ Subscribe click on {channel_url} did not change the button state")
+                    return FAILED, NOT_CONFIRMED
                 print(f"✓ Subscribed to {channel_url}")
-                return True
+                return DONE, None
             else:
                 print(f"- Already subscribed to {channel_url}")
-                return True
+                return ALREADY_PRESENT, None
+        
+        print(f"✗ Could not find subscribe button for {channel_url}")
+        if not debug:
+            debug_snapshot(driver, channel_url, "channel", "not-found", diagnose=False)
+        return FAILED, MISSING_ELEMENT
                 
     except Exception as e:
         if debug:
             print(f"✗ Error subscribing to {channel_url}: {e}")
         else:
             print(f"✗ Failed to subscribe to {channel_url}")
-        return False
+        if not debug:
+            debug_snapshot(driver, channel_url, "channel", "error", diagnose=False)
+        return FAILED, classify_exception(e)
+
+def add_to_watch_later(driver, video_url, debug=False, preloaded=False):
+    """Original watch later logic with optional debugging; returns (status, error class or None)"""
+    return save_to_playlist(driver, video_url, "Watch later", debug, preloaded)
 
-def add_to_watch_later(driver, video_url, debug=False):
-    """Original watch later logic with optional debugging"""
+def save_to_playlist(driver, video_url, playlist_name="Watch later", debug=False, preloaded=False):
+    """
+    Save one video to playlist_name (which must exist) through the watch
+    page's save menu. A ticked option means the video is already there
+    (clicking would remove it). Returns (status, error class or None).
+    """
     try:
-        driver.get(video_url)
-        time.sleep(3)
+        _open(driver, video_url, "video", preloaded)
         
         if debug:
-            debug_page_elements(driver, "video")
+            debug_snapshot(driver, video_url, "video", "debug")
         
-        # Your original selectors
-        selectors = [
-            '//button[@aria-label="Save to Watch later"]',
-            '//button[contains(@aria-label, "Save to")]',
-            '//ytd-playlist-add-to-button-renderer//button',
-            '//button[contains(@title, "Save")]'
-        ]
+        found = probe(driver, "save", timeout=5, required=["save", "watch later"])
         
-        watch_later_button = None
-        for selector in selectors:
-            try:
-                watch_later_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                break
-            except TimeoutException:
-                continue
-        
-        if watch_later_button:
-            watch_later_button.click()
-            time.sleep(2)
+        if found:
+            if debug:
+                print(f"  {_describe(found)}")
+            _click(found['element'])
             
-            try:
-                wl_option = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, 
-                        '//yt-formatted-string[text()="Watch later"] | //span[text()="Watch later"]'))
-                )
-                wl_option.click()
-                print(f"✓ Added {video_url} to Watch Later")
-                return True
-            except TimeoutException:
+            if playlist_name == "Watch later":
+                option = probe(driver, "watch-later-option", timeout=5)
+            else:
+                option = probe(driver, "playlist-option", timeout=5, required=[playlist_name.lower()], exact=True)
+            if option:
+                if debug:
+                    print(f"  {_describe(option)}")
+                if option_checked(driver, option):
+                    print(f"- {video_url} is already in {playlist_name}")
+                    return ALREADY_PRESENT, None
+                _click(option['element'])
+                print(f"✓ Added {video_url} to {playlist_name}")
+                return DONE, None
+            elif playlist_name == "Watch later":
                 print(f"~ Clicked save for {video_url}")
-                return True
+                return UNCONFIRMED, None
+            else:
+                print(f"✗ Could not find '{playlist_name}' in the save dialog for {video_url}")
+                return FAILED, MISSING_ELEMENT
         else:
             print(f"✗ Could not find save button for {video_url}")
-            return False
+            if not debug:
+                debug_snapshot(driver, video_url, "video", "not-found", diagnose=False)
+            return FAILED, MISSING_ELEMENT
             
     except Exception as e:
         if debug:
-            print(f"✗ Error adding {video_url} to Watch Later: {e}")
+            print(f"✗ Error adding {video_url} to {playlist_name}: {e}")
         else:
-            print(f"✗ Failed to add {video_url} to Watch Later")
-        return False
\ No newline at end of file
+            print(f"✗ Failed to add {video_url} to {playlist_name}")
+        if not debug:
+            debug_snapshot(driver, video_url, "video", "error", diagnose=False)
+        return FAILED, classify_exception(e)
@@ -1,9 +1,8 @@
-import json
 import time
+from utils import load_youtube_data
 
 def migrate_youtube_data(driver):
-    with open("data/youtube-data.json", "r") as f:
-        data = json.load(f)
+    data = {name: items.urls() for name, items in load_youtube_data("data/youtube-data.json").items()}
 
     # Subscribe to channels
     for channel in data["subscriptions"]:
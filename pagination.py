@@ -0,0 +1,139 @@
+import json
+import time
+from initial_data import parse_initial_data
+from metrics import timed
+
+# Endpoint YouTube's own client posts continuation tokens to
+BROWSE_API_PATH = "/youtubei/v1/browse"
+
+# Runs in the logged-in page: follows each token's chain of continuation pages
+# with fetch() (same origin, so the session cookies apply), up to maxPages per
+# chain, all chains concurrently. A chain can also start from a browse request
+# such as {browseId: 'VL' + playlist ID}, which returns a list's first page.
+# Returns the raw JSON text of every page plus the token to resume from;
+# nothing is rendered. Parsing stays in Python.
+CONTINUATION_FETCH_JS = """
+const tokens = arguments[0];
+const maxPages = arguments[1];
+const apiPath = arguments[2];
+const done = arguments[arguments.length - 1];
+const cfg = (key, fallback) => (window.ytcfg && window.ytcfg.get && window.ytcfg.get(key)) || fallback;
+const apiKey = cfg('INNERTUBE_API_KEY', null);
+const context = cfg('INNERTUBE_CONTEXT', {client: {clientName: 'WEB', clientVersion: cfg('INNERTUBE_CLIENT_VERSION', '2.20240101.00.00')}});
+const authHeader = async () => {
+    const match = document.cookie.match(/(?:^|;\\s*)(?:__Secure-3PAPISID|SAPISID)=([^;]+)/);
+    if (!match || !window.crypto || !crypto.subtle) return null;
+    const now = Math.floor(Date.now() / 1000);
+    const digest = await crypto.subtle.digest('SHA-1', new TextEncoder().encode(now + ' ' + match[1] + ' ' + location.origin));
+    const hex = Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+    return 'SAPISIDHASH ' + now + '_' + hex;
+};
+const nextToken = (root) => {
+    let token = null;
+    const stack = [root];
+    while (stack.length) {
+        const node = stack.pop();
+        if (!node || typeof node !== 'object') continue;
+        if (node.continuationCommand && node.continuationCommand.token) token = node.continuationCommand.token;
+        for (const value of Object.values(node)) stack.push(value);
+    }
+    return token;
+};
+const fetchPage = async (token) => {
+    const headers = {
+        'Content-Type': 'application/json',
+        'X-Youtube-Client-Name': '1',
+        'X-Youtube-Client-Version': context.client.clientVersion,
+    };
+    const auth = await authHeader();
+    if (auth) {
+        headers['Authorization'] = auth;
+        headers['X-Origin'] = location.origin;
+    }
+    const url = apiPath + '?prettyPrint=false' + (apiKey ? '&key=' + apiKey : '');
+    const response = await fetch(url, {
+        method: 'POST', credentials: 'include', headers: headers,
+        body: JSON.stringify(Object.assign({context: context}, typeof token === 'string' ? {continuation: token} : token)),
+    });
+    if (!response.ok) throw new Error('HTTP ' + response.status);
+    return response.text();
+};
+const chain = async (token) => {
+    const responses = [];
+    let next = token;
+    try {
+        for (let page = 0; page < maxPages && next; page++) {
+            const text = await fetchPage(next);
+            responses.push(text);
+            next = nextToken(JSON.parse(text));
+        }
+        return {responses: responses, next: next, error: null};
+    } catch (e) {
+        return {responses: responses, next: next, error: String(e)};
+    }
+};
+Promise.all(tokens.map(chain)).then(done);
+"""
+
+def fetch_continuations(driver, tokens, pages_per_call=10, timeout=120, api_path=BROWSE_API_PATH):
+    """
+    One round trip: up to pages_per_call pages for each token (or browse
+    request dict); returns one chain result per token, in order.
+    """
+    driver.set_script_timeout(timeout)
+    with timed("continuation"):
+        return driver.execute_async_script(CONTINUATION_FETCH_JS, list(tokens), pages_per_call, api_path) or []
+
+def load_continuations(driver, tokens, on_page, pages_per_call=10, timeout=120):
+    """
+    Follow continuation tokens from the first page's data until every chain
+    ends, calling on_page(parsed) for each page parsed with parse_initial_data;
+    a truthy return from on_page stops loading. Returns (pages loaded, error
+    or None); on error the caller can fall back to scrolling.
+    """
+    pages = 0
+    tokens = [token for token in tokens if token]
+    while tokens:
+        try:
+            chains = fetch_continuations(driver, tokens, pages_per_call, timeout)
+        except Exception as e:
+            return pages, str(e)
+        tokens = []
+        for chain in chains:
+            for raw in chain.get("responses", []):
+                pages += 1
+                if on_page(parse_initial_data(json.loads(raw))):
+                    return pages, None
+            if chain.get("error"):
+                return pages, chain["error"]
+            if chain.get("next"):
+                tokens.append(chain["next"])
+    return pages, None
+
+def compare_pagination(driver, base_url, idle_timeout=10):
+    """Load Watch Later by scrolling and by continuation fetches; print wall time and Chrome RSS for each"""
+    from browser import chrome_rss_mb
+    from scraper import scrape_watch_later
+
+    results = {}
+    for label, backend in (("scroll", "dom"), ("continuation", "initial-data")):
+        start = time.perf_counter()
+        videos = scrape_watch_later(driver, idle_timeout=idle_timeout, base_url=base_url, backend=backend)
+        results[label] = {"videos": len(videos), "seconds": time.perf_counter() - start, "rss_mb": chrome_rss_mb(driver)}
+
+    print("\n--- Watch Later loading ---")
+    for label, stats in results.items():
+        rss_text = f"{stats['rss_mb']:.0f} MB RSS" if stats["rss_mb"] else "RSS unavailable"
+        print(f"{label:>12}: {stats['videos']} videos in {stats['seconds']:.2f}s, {rss_text}")
+    return results
+
+if __name__ == "__main__":
+    from browser import create_driver
+    from fixture_server import FixtureServer
+
+    with FixtureServer(subscriptions=10, watch_later=2000, latency_ms=50) as server:
+        driver = create_driver(headless=True)
+        try:
+            compare_pagination(driver, server.base_url)
+        finally:
+            driver.quit()
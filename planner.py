@@ -0,0 +1,44 @@
+from scraper import scrape_subscriptions, scrape_watch_later
+from utils import DATA_KINDS, YOUTUBE_URL, ItemSet
+
+def scrape_destination(driver, base_url=YOUTUBE_URL):
+    """Scrape the logged-in destination account once with the same extraction as the source scrape"""
+    print("\n=== SCRAPING DESTINATION ACCOUNT ===")
+    destination = {
+        "subscriptions": scrape_subscriptions(driver, manual_fallback=False, base_url=base_url),
+        "watch_later": scrape_watch_later(driver, base_url=base_url),
+    }
+    print(f"Destination has {len(destination['subscriptions'])} subscriptions and {len(destination['watch_later'])} watch later videos")
+    return destination
+
+def diff_items(source, destination):
+    """Split each source section by canonical ID into (missing, present) in the destination"""
+    missing = {}
+    present = {}
+    for name, kind in DATA_KINDS.items():
+        have = destination.get(name, ItemSet(kind))
+        missing[name] = ItemSet(kind, [key for key in source.get(name, []) if key not in have])
+        present[name] = ItemSet(kind, [key for key in source.get(name, []) if key in have])
+    return missing, present
+
+def plan_migration(driver, source, base_url=YOUTUBE_URL):
+    """Planning phase: return (missing, present) so migration only visits what the destination lacks"""
+    missing, present = diff_items(source, scrape_destination(driver, base_url))
+
+    print("\n=== MIGRATION PLAN ===")
+    for name in DATA_KINDS:
+        print(f"{name}: {len(missing[name])} to migrate, {len(present[name])} already in destination")
+    return missing, present
+
+def verify_migration(driver, source, base_url=YOUTUBE_URL):
+    """Bulk verification pass: re-scrape the destination once and return what is still missing"""
+    missing, _ = diff_items(source, scrape_destination(driver, base_url))
+
+    print("\n=== VERIFICATION ===")
+    for name in DATA_KINDS:
+        print(f"{name}: {len(source.get(name, [])) - len(missing[name])}/{len(source.get(name, []))} present in destination")
+        for url in missing[name].urls(base_url)[:10]:
+            print(f"  missing: {url}")
+        if len(missing[name]) > 10:
+            print(f"  ... and {len(missing[name]) - 10} more")
+    return missing
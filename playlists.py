@@ -0,0 +1,307 @@
+import json
+import os
+import time
+from functools import partial
+from batching import add_videos_in_batches, create_playlist_in_dialog
+from initial_data import parse_initial_data, read_page_items
+from metrics import default_metrics, timed
+from migrator import migrate_item, run_retries
+from pagination import fetch_continuations, load_continuations
+from ratelimit import AIMDRateController, Unpaced
+from readiness import navigate
+from retry import RetryScheduler
+from scraper import scrape_playlist
+from selector_registry import probe
+from state import ALREADY_PRESENT, DONE, FAILED, SUCCESS_STATUSES
+from utils import YOUTUBE_URL, ItemSet, canonical_key, canonical_url
+from worker_pool import run_worker_pool, start_worker_drivers, stop_worker_drivers
+
+# Built-in lists that are not user playlists: Watch Later is migrated on its
+# own, and Liked videos are likes rather than saves
+SYSTEM_PLAYLISTS = ("WL", "LL")
+
+class Playlist:
+    """One user playlist: its ID on the source account, title, and videos in order"""
+
+    def __init__(self, playlist_id, title, videos=()):
+        self.id = playlist_id
+        self.title = title
+        self.videos = ItemSet("video", videos)
+
+    def __str__(self):
+        return f"'{self.title}' ({len(self.videos)} videos)"
+
+    def to_dict(self):
+        return {"id": self.id, "title": self.title, "videos": self.videos.to_compact()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data.get("title") or data["id"], data.get("videos", []))
+
+def save_playlists(path, playlists):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"playlists": [playlist.to_dict() for playlist in playlists]}, f, indent=4)
+
+def load_playlists(path):
+    with open(path, "r") as f:
+        return [Playlist.from_dict(data) for data in json.load(f).get("playlists", [])]
+
+def discover_playlists(driver, base_url=YOUTUBE_URL):
+    """The account's playlists from /feed/playlists (following continuations), without the built-in ones"""
+    navigate(driver, f"{base_url}/feed/playlists", "feed")
+    found = {}
+
+    def add(parsed):
+        for entry in parsed["playlists"]:
+            if entry["id"] not in SYSTEM_PLAYLISTS and entry["id"] not in found:
+                found[entry["id"]] = Playlist(entry["id"], entry["title"])
+
+    parsed = read_page_items(driver)
+    if not parsed:
+        print("✗ No ytInitialData on /feed/playlists")
+        return []
+    add(parsed)
+    pages, error = load_continuations(driver, parsed["continuations"], add)
+    if error:
+        print(f"! Playlist list continuation failed after {pages} pages: {error}")
+    print(f"Found {len(found)} playlists")
+    return list(found.values())
+
+def fetch_playlist_videos(driver, playlists, pages_per_call=10, base_url=YOUTUBE_URL):
+    """
+    Fill every playlist's videos at once: each playlist is one browse chain
+    in the in-page fetch, so all of them load concurrently, pages_per_call
+    pages per round trip. Playlists whose chain fails are loaded one by one
+    with scrape_playlist. Returns {playlist ID: {"pages", "seconds"}}.
+    """
+    stats = {playlist.id: {"pages": 0, "seconds": None} for playlist in playlists}
+    start = time.perf_counter()
+    pending = [(playlist, {"browseId": "VL" + playlist.id}) for playlist in playlists]
+    failed = []
+    while pending:
+        try:
+            chains = fetch_continuations(driver, [request for _, request in pending], pages_per_call)
+        except Exception as e:
+            print(f"! Playlist fetch failed: {e}")
+            failed.extend(playlist for playlist, _ in pending)
+            break
+        waiting = []
+        for (playlist, _), chain in zip(pending, chains):
+            for raw in chain.get("responses", []):
+                stats[playlist.id]["pages"] += 1
+                for entry in parse_initial_data(json.loads(raw))["videos"]:
+                    playlist.videos.add(entry["id"])
+            if chain.get("error"):
+                print(f"  ! {playlist}: {chain['error']}")
+                failed.append(playlist)
+            elif chain.get("next"):
+                waiting.append((playlist, chain["next"]))
+            else:
+                stats[playlist.id]["seconds"] = time.perf_counter() - start
+                print(f"  ✓ {playlist} in {stats[playlist.id]['seconds']:.1f}s")
+        pending = waiting
+
+    for playlist in failed:
+        playlist_start = time.perf_counter()
+        playlist.videos = scrape_playlist(driver, playlist.id, base_url=base_url, label=playlist.title)
+        stats[playlist.id]["seconds"] = time.perf_counter() - playlist_start
+        print(f"  ✓ {playlist} from the page in {stats[playlist.id]['seconds']:.1f}s")
+    return stats
+
+def scrape_playlists(driver, base_url=YOUTUBE_URL, output_path="data/youtube-playlists.json", pages_per_call=10):
+    """Discover the source account's playlists, load all of their videos, and save them to output_path"""
+    print("\n=== PLAYLIST SCRAPING ===")
+    with timed("discover"):
+        playlists = discover_playlists(driver, base_url)
+    with timed("playlist_videos"):
+        stats = fetch_playlist_videos(driver, playlists, pages_per_call, base_url)
+    save_playlists(output_path, playlists)
+
+    print(f"\n{'Playlist':<40} {'Videos':>7} {'Pages':>6} {'Seconds':>8} {'Videos/s':>9}")
+    for playlist in playlists:
+        entry = stats[playlist.id]
+        seconds = entry["seconds"] or 0.0
+        rate = f"{len(playlist.videos) / seconds:.0f}" if seconds else "n/a"
+        print(f"{playlist.title[:40]:<40} {len(playlist.videos):>7} {entry['pages']:>6} {seconds:>8.1f} {rate:>9}")
+    print(f"Saved {len(playlists)} playlists ({sum(len(playlist.videos) for playlist in playlists)} videos) "
+          f"to {os.path.basename(output_path)}")
+    return playlists
+
+def ensure_playlist(driver, playlist, video_url, store=None, debug=False):
+    """
+    Make sure a playlist titled like the source one exists on the destination,
+    creating it once from video_url's save dialog (that video goes into it).
+    The store remembers it under "playlists", so a rerun never creates it
+    again. Returns whether the playlist exists.
+    """
+    if store is not None:
+        store.add_items("playlists", [playlist.id])
+        if store.status("playlists", playlist.id) in SUCCESS_STATUSES:
+            return True
+    try:
+        navigate(driver, video_url, "video")
+        save = probe(driver, "save", timeout=5, required=["save", "watch later"])
+        if not save:
+            print(f"✗ Could not open a save dialog to create {playlist.title}")
+            return False
+        with timed("click"):
+            save['element'].click()
+        # Longer than the per-video probe: a slow dialog must not pass for a missing playlist
+        if probe(driver, "playlist-option", timeout=15, required=[playlist.title.lower()], exact=True):
+            status = ALREADY_PRESENT
+            if debug:
+                print(f"  '{playlist.title}' already exists on the destination")
+        elif create_playlist_in_dialog(driver, playlist.title):
+            status = DONE
+        else:
+            return False
+    except Exception as e:
+        print(f"✗ Could not create {playlist.title}: {e}")
+        return False
+    if store is not None:
+        store.mark("playlists", playlist.id, status)
+    return True
+
+def migrate_playlist(driver, playlist, rate, store=None, base_url=YOUTUBE_URL, batch_size=0, debug=False,
+                     retries=None):
+    """
+    Recreate one playlist on the destination under the same title and fill it
+    in the source order, through the save menu (or batches of batch_size via
+    "Add all to…"). The playlist is created once, before the first save;
+    failed videos go to the retry scheduler like any other item. Returns its stats.
+    """
+    kind = f"playlist:{playlist.id}"
+    if store is not None:
+        store.add_items(kind, playlist.videos)
+        keys = list(store.unfinished(kind))
+    else:
+        keys = list(playlist.videos)
+    urls = [canonical_url(key, "video", base_url) for key in keys]
+    stats = {"id": playlist.id, "title": playlist.title, "videos": len(playlist.videos), "todo": len(urls),
+             "successful": 0, "failed": 0}
+    start = time.perf_counter()
+
+    if urls and not ensure_playlist(driver, playlist, urls[0], store, debug):
+        stats["failed"] = len(urls)
+        urls = []
+
+    handle = partial(
+        migrate_item, debug_mode=debug, interactive_mode=False, rate=rate, store=store, retries=retries,
+        playlist_name=playlist.title
+    )
+
+    def record_batched(url, status):
+        stats["successful"] += 1
+        if store is not None:
+            store.mark(kind, canonical_key(url, "video"), status)
+
+    if batch_size > 1:
+        urls = add_videos_in_batches(
+            driver, urls, rate, base_url, batch_size, playlist.title, debug, on_result=record_batched
+        )
+
+    for i, url in enumerate(urls, 1):
+        print(f"\n[{playlist.title}] {i}/{len(urls)}: {url}")
+        status = handle(driver, kind, url)
+        stats["successful" if status in SUCCESS_STATUSES else "failed"] += 1
+        recovered = run_retries(driver, retries, handle, kind).get(kind, 0)
+        stats["successful"] += recovered
+        stats["failed"] -= recovered
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["items_per_sec"] = stats["todo"] / stats["seconds"] if stats["seconds"] else None
+    print(f"{'✓' if not stats['failed'] else '!'} {playlist}: {stats['successful']}/{stats['todo']} migrated "
+          f"in {stats['seconds']:.1f}s")
+    return stats
+
+def migrate_playlists(driver, playlists=None, path="data/youtube-playlists.json", rate_controller=None,
+                      max_per_minute=30, store=None, base_url=YOUTUBE_URL, batch_size=0, debug=False, workers=1,
+                      driver_factory=None, retries=None):
+    """
+    Recreate and fill every scraped playlist (from path unless given). With
+    workers > 1 and a driver_factory, whole playlists are shared between a
+    pool of logged-in browsers, so no two browsers ever create the same one.
+    Failed videos are retried as in migrate_youtube_data (retries=False turns
+    that off). Prints per-playlist progress and throughput; returns the stats.
+    """
+    if playlists is None:
+        try:
+            playlists = load_playlists(path)
+        except FileNotFoundError:
+            print(f"Error: {path} not found. Please scrape playlists first.")
+            return []
+    print(f"\n=== PROCESSING {len(playlists)} PLAYLISTS ===")
+    rate = rate_controller or AIMDRateController(max_rate=max_per_minute, history_path="data/rate-history.csv")
+    if retries is None:
+        retries = RetryScheduler()
+    elif retries is False:
+        retries = None
+
+    drivers = [driver]
+    if workers > 1 and driver_factory is not None:
+        drivers = start_worker_drivers(driver, workers, driver_factory, base_url)
+    for worker_driver in drivers:
+        default_metrics().track_driver(worker_driver)
+
+    results = []
+
+    def run_playlist(worker_driver, playlist):
+        with timed("playlist"):
+            stats = migrate_playlist(worker_driver, playlist, rate, store, base_url, batch_size, debug, retries)
+        results.append(stats)
+        return DONE if not stats["failed"] else FAILED
+
+    try:
+        if len(drivers) > 1:
+            # Every video acquires the rate controller itself; the playlists are not paced on top
+            run_worker_pool(drivers, playlists, run_playlist, Unpaced(), "playlist")
+        else:
+            for playlist in playlists:
+                run_playlist(driver, playlist)
+    finally:
+        stop_worker_drivers(drivers[1:])
+
+    titles = {f"playlist:{playlist.id}": playlist.title for playlist in playlists}
+
+    def retry_video(retry_driver, section, url):
+        return migrate_item(retry_driver, section, url, debug, False, rate, store, retries=retries,
+                            playlist_name=titles[section])
+
+    recovered = run_retries(driver, retries, retry_video, wait=True)
+    for stats in results:
+        count = recovered.get(f"playlist:{stats['id']}", 0)
+        stats["successful"] += count
+        stats["failed"] -= count
+
+    print(f"\n{'Playlist':<40} {'Migrated':>9} {'Failed':>7} {'Seconds':>8} {'Items/s':>8}")
+    for stats in results:
+        items_per_sec = f"{stats['items_per_sec']:.2f}" if stats["items_per_sec"] else "n/a"
+        print(f"{stats['title'][:40]:<40} {stats['successful']:>4}/{stats['todo']:<4} {stats['failed']:>7} "
+              f"{stats['seconds']:>8.1f} {items_per_sec:>8}")
+    if retries is not None:
+        retries.report()
+    return results
+
+if __name__ == "__main__":
+    import tempfile
+    from browser import create_driver
+    from fixture_server import FixtureServer
+    from ratelimit import RateCap
+
+    with FixtureServer(subscriptions=0, watch_later=0, page_size=100, latency_ms=50, playlists=5,
+                       playlist_size=250) as server:
+        driver = create_driver(headless=True)
+        try:
+            output_path = os.path.join(tempfile.mkdtemp(prefix="ytm-playlists-"), "youtube-playlists.json")
+            scraped = scrape_playlists(driver, server.base_url, output_path)
+            migrate_playlists(driver, path=output_path, rate_controller=RateCap(6000), base_url=server.base_url,
+                              batch_size=50, retries=False)
+            state = server.state()
+            for playlist in scraped:
+                created = state["created"].get(playlist.title)
+                migrated = state["saved"].get(created, []) if created else []
+                ok = migrated == list(playlist.videos) and len(migrated) == len(server.playlist_videos(playlist.id))
+                print(f"{'✓' if ok else '✗'} {playlist.title}: {len(migrated)}/{len(playlist.videos)} in the destination")
+        finally:
+            driver.quit()
@@ -0,0 +1,111 @@
+import os
+import random
+import threading
+import time
+from state import FAILED, SUCCESS_STATUSES
+
+class RateCap:
+    """Thread-safe global cap on actions per minute, shared by every worker"""
+    
+    def __init__(self, max_per_minute):
+        self.interval = 60.0 / max_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+    
+    def acquire(self):
+        """Block until the next free slot under the cap"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+    
+    def record(self, status, throttled=False):
+        """Fixed cap: outcomes don't change the rate"""
+    
+    @property
+    def current_rate(self):
+        return 60.0 / self.interval
+
+class Unpaced:
+    """Rate controller that never waits, for queues whose items acquire the real controller themselves"""
+    
+    def acquire(self):
+        pass
+    
+    def record(self, status, throttled=False):
+        pass
+    
+    @property
+    def current_rate(self):
+        return None
+
+class AIMDRateController:
+    """
+    Token bucket whose refill rate (actions per minute) grows additively while
+    actions succeed and is cut multiplicatively on signs of throttling.
+    Thread-safe, so one controller can pace every worker in the pool.
+    """
+    
+    def __init__(self, initial_rate=10, min_rate=2, max_rate=30, increase=1, decrease=0.5,
+                 jitter=0.3, burst=1, history_path=None):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.jitter = jitter
+        self.burst = burst
+        self.history_path = history_path
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.history = []
+        self._log("start")
+    
+    @property
+    def current_rate(self):
+        return self._rate
+    
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate / 60.0)
+        self._updated = now
+    
+    def acquire(self):
+        """Block until a token is available, plus random jitter so requests don't look scripted"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    interval = 60.0 / self._rate
+                    break
+                wait = (1 - self._tokens) * 60.0 / self._rate
+            time.sleep(wait)
+        time.sleep(random.uniform(0, self.jitter * interval))
+    
+    def record(self, status, throttled=False):
+        """Additive increase on success, multiplicative decrease on failure or throttling"""
+        with self._lock:
+            if throttled or status == FAILED:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                event = "throttled" if throttled else "failed"
+            elif status in SUCCESS_STATUSES:
+                self._rate = min(self.max_rate, self._rate + self.increase)
+                event = "success"
+            else:
+                return
+            self._log(event)
+    
+    def _log(self, event):
+        entry = (time.time(), self._rate, event)
+        self.history.append(entry)
+        if self.history_path:
+            new_file = not os.path.exists(self.history_path)
+            with open(self.history_path, "a") as f:
+                if new_file:
+                    f.write("timestamp,rate_per_minute,event\n")
+                f.write(f"{entry[0]:.3f},{entry[1]:.2f},{entry[2]}\n")
@@ -0,0 +1,134 @@
+import os
+import time
+from metrics import timed
+
+# Longest we wait for a page type to become usable before carrying on anyway
+PAGE_READY_CAPS = {
+    "channel": 10,
+    "video": 10,
+    "feed": 15,
+    "playlist": 15,
+    "default": 10,
+}
+
+# Element whose presence means the page is ready for the next step
+PAGE_READY_TARGETS = {
+    "channel": "ytd-subscribe-button-renderer, #subscribe-button",
+    "video": "ytd-watch-metadata #top-level-buttons-computed, #top-level-buttons ytd-menu-renderer, ytd-menu-renderer",
+    "feed": "ytd-channel-renderer, ytd-grid-channel-renderer",
+    "playlist": "ytd-playlist-video-renderer, ytd-playlist-video-list-renderer",
+}
+
+# Installed on every new document through CDP so YouTube's SPA events are
+# recorded even when they fire before our wait script gets to run.
+EVENT_HOOK_JS = """
+window.__ytReadiness = {navigateFinish: 0, pageDataUpdated: 0};
+document.addEventListener('yt-navigate-finish', () => { window.__ytReadiness.navigateFinish = Date.now(); }, true);
+document.addEventListener('yt-page-data-updated', () => { window.__ytReadiness.pageDataUpdated = Date.now(); }, true);
+"""
+
+# Polls inside the page: document ready, YouTube navigation finished (when the
+# hook is installed) and the target element present, all in one round trip.
+WAIT_READY_JS = """
+const target = arguments[0];
+const capMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const check = () => {
+    const elapsed = performance.now() - start;
+    const documentReady = document.readyState !== 'loading';
+    const hook = window.__ytReadiness;
+    const ytReady = !hook || hook.navigateFinish > 0 || hook.pageDataUpdated > 0;
+    const targetReady = !target || document.querySelector(target) !== null;
+    if (documentReady && ytReady && targetReady) {
+        done({ready: true, ms: elapsed, hooked: !!hook});
+    } else if (elapsed >= capMs) {
+        done({ready: false, ms: elapsed, hooked: !!hook, documentReady: documentReady, ytReady: ytReady, targetReady: targetReady});
+    } else {
+        setTimeout(check, 50);
+    }
+};
+check();
+"""
+
+# Consent walls, "unusual traffic" pages and captchas: YouTube telling us to slow down
+INTERSTITIAL_JS = """
+const url = location.href;
+if (/consent\\.(youtube|google)\\.com|google\\.com\\/sorry/.test(url)) return 'redirect';
+if (document.querySelector('#captcha-form, iframe[src*="recaptcha"], ytd-consent-bump-v2-lightbox, tp-yt-paper-dialog #captcha')) return 'dialog';
+const text = document.body ? document.body.innerText.slice(0, 5000) : '';
+if (/unusual traffic|not a robot/i.test(text)) return 'text';
+return null;
+"""
+
+_hooked_drivers = set()
+
+def install_event_hook(driver, handle=None):
+    """
+    Register the yt-navigate-finish / yt-page-data-updated recorder for every
+    future document. CDP scripts are per tab: pass the window handle when
+    installing into a tab other than the first.
+    """
+    key = (id(driver), handle)
+    if key in _hooked_drivers:
+        return True
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": EVENT_HOOK_JS})
+    except Exception:
+        return False
+    _hooked_drivers.add(key)
+    return True
+
+def wait_until_ready(driver, page_type="default", target=None, cap=None):
+    """Wait until the current page is usable or the page type's cap runs out; returns the in-page result"""
+    cap = cap if cap is not None else PAGE_READY_CAPS.get(page_type, PAGE_READY_CAPS["default"])
+    target = target if target is not None else PAGE_READY_TARGETS.get(page_type)
+    driver.set_script_timeout(cap + 5)
+    try:
+        return driver.execute_async_script(WAIT_READY_JS, target, int(cap * 1000))
+    except Exception as e:
+        return {"ready": False, "error": str(e)}
+
+def navigate(driver, url, page_type="default", target=None, cap=None):
+    """driver.get(url), then wait on readiness signals instead of a fixed sleep"""
+    install_event_hook(driver)
+    with timed("navigate"):
+        driver.get(url)
+    with timed("ready"):
+        return wait_until_ready(driver, page_type, target, cap)
+
+def detect_interstitial(driver):
+    """Return what kind of throttling interstitial the current page shows, or None"""
+    try:
+        return driver.execute_script(INTERSTITIAL_JS)
+    except Exception:
+        return None
+
+def compare_fixed_sleep(driver, urls, page_type="channel", fixed_sleep=3):
+    """Per-item latency of driver.get + fixed sleep versus navigate() on the same URLs"""
+    before = []
+    after = []
+    for url in urls:
+        start = time.perf_counter()
+        driver.get(url)
+        time.sleep(fixed_sleep)
+        before.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        navigate(driver, url, page_type)
+        after.append(time.perf_counter() - start)
+    
+    print(f"\n--- Page readiness ({len(urls)} loads) ---")
+    print(f"Fixed {fixed_sleep}s sleep: avg {sum(before) / len(before):.2f}s per item")
+    print(f"Readiness wait:   avg {sum(after) / len(after):.2f}s per item")
+    return before, after
+
+if __name__ == "__main__":
+    from browser import create_driver
+    
+    fixture = "file://" + os.path.abspath(os.path.join(os.path.dirname(__file__), "fixtures", "channel.html"))
+    driver = create_driver()
+    try:
+        compare_fixed_sleep(driver, [f"{fixture}?delay={delay}" for delay in (200, 600, 1500) * 3])
+    finally:
+        driver.quit()
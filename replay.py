@@ -0,0 +1,319 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from selenium import webdriver
+from selenium.common import exceptions as selenium_exceptions
+from selenium.webdriver.chrome.options import Options
+from benchmark import TimingRate
+from browser import create_driver
+from fixture_server import FixtureServer
+from metrics import default_metrics, percentile
+from migrator import migrate_youtube_data
+from scraper import scrape_youtube_data
+from selector_registry import SelectorRegistry, set_default_registry
+from utils import YOUTUBE_URL, count_webdriver_commands
+
+# How far past the replay cursor a command may be found; further away counts as not recorded
+LOOKAHEAD = 50
+
+def _key(command, params):
+    """Identity of a command for matching: its name and parameters, minus the session ID"""
+    params = {name: value for name, value in (params or {}).items() if name != "sessionId"}
+    return command + " " + json.dumps(params, sort_keys=True, default=str)
+
+class ReplayMismatch(Exception):
+    """The code under replay sent a command the recording has no answer for"""
+
+class SessionRecorder:
+    """
+    Records every WebDriver command a driver sends, with its response and
+    round-trip time, as JSONL at path: a session header line, then one line
+    per command tagged with the item being handled, if any. Commands still go
+    to the browser unchanged.
+    """
+
+    def __init__(self, driver, path, base_url=YOUTUBE_URL):
+        self.driver = driver
+        self.path = path
+        self.base_url = base_url
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._original_execute = None
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w")
+        self._write({
+            "type": "session", "session_id": self.driver.session_id, "capabilities": self.driver.capabilities,
+            "base_url": self.base_url, "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
+        executor = self.driver.command_executor
+        self._original_execute = executor.execute
+
+        def recording_execute(command, params):
+            item = default_metrics().current_item()
+            entry = {
+                "type": "command", "command": command,
+                "params": {name: value for name, value in (params or {}).items() if name != "sessionId"},
+                "item": f"{item['section']}:{item['item']}" if item else None,
+            }
+            start = time.perf_counter()
+            try:
+                response = self._original_execute(command, params)
+            except Exception as e:
+                entry.update(seconds=time.perf_counter() - start, error={"type": type(e).__name__, "message": str(e)})
+                self._write(entry)
+                raise
+            entry.update(seconds=time.perf_counter() - start, response=response)
+            self._write(entry)
+            return response
+
+        executor.execute = recording_execute
+        return self
+
+    def _write(self, entry):
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            if entry["type"] == "command":
+                self.recorded += 1
+
+    def stop(self):
+        if self._original_execute is not None:
+            self.driver.command_executor.execute = self._original_execute
+            self._original_execute = None
+        if self._file:
+            self._file.close()
+            self._file = None
+        print(f"✓ Recorded {self.recorded} WebDriver commands to {self.path}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def read_recording(path):
+    """(session header, command entries) of a recording"""
+    header = None
+    entries = []
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("type") == "session":
+                header = entry
+            else:
+                entry["key"] = _key(entry["command"], entry.get("params"))
+                entries.append(entry)
+    return header or {}, entries
+
+class ReplayExecutor:
+    """
+    Stands in for a driver's command executor: answers each command from a
+    recording instead of a browser. A command is matched to the next unused
+    entry with the same parameters (or, failing that, the same command name)
+    within LOOKAHEAD entries of the cursor. latency="original" sleeps for the
+    recorded round-trip time; "zero" answers at once. Without strict, a
+    command the recording doesn't have gets the last answer to the same
+    command, so extra polls of an unchanged page still work.
+    """
+
+    def __init__(self, header, entries, latency="zero", strict=False):
+        self.header = header
+        self.entries = entries
+        self.latency = latency
+        self.strict = strict
+        self.used = [False] * len(entries)
+        self.cursor = 0
+        self.loose_matches = 0
+        self.repeated = 0
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def execute(self, command, params):
+        if command == "newSession":
+            return {"value": {"sessionId": self.header.get("session_id") or "replay",
+                              "capabilities": self.header.get("capabilities") or {}}}
+        key = _key(command, params)
+        with self._lock:
+            index = self._find(key, command)
+            if index is None:
+                if command in ("quit", "close") or (not self.strict and key in self._last):
+                    self.repeated += 1
+                    entry = self._last.get(key, {"response": {"value": None}})
+                else:
+                    raise ReplayMismatch(f"{command} {key[len(command) + 1:][:200]} is not in the recording "
+                                         f"(cursor at entry {self.cursor} of {len(self.entries)})")
+            else:
+                entry = self.entries[index]
+                self.used[index] = True
+                self._last[key] = entry
+                while self.cursor < len(self.entries) and self.used[self.cursor]:
+                    self.cursor += 1
+        if self.latency == "original":
+            time.sleep(entry.get("seconds", 0))
+        if "error" in entry:
+            error_class = getattr(selenium_exceptions, entry["error"]["type"], selenium_exceptions.WebDriverException)
+            raise error_class(entry["error"]["message"])
+        # A fresh copy each time: the driver replaces element references in place
+        return json.loads(json.dumps(entry["response"]))
+
+    def _find(self, key, command):
+        window = range(self.cursor, min(len(self.entries), self.cursor + LOOKAHEAD))
+        for index in window:
+            if not self.used[index] and self.entries[index]["key"] == key:
+                return index
+        for index in window:
+            if not self.used[index] and self.entries[index]["command"] == command:
+                self.loose_matches += 1
+                return index
+        return None
+
+    def close(self):
+        pass
+
+    def report(self):
+        unused = self.used.count(False)
+        print(f"Replay: {len(self.entries) - unused}/{len(self.entries)} recorded commands served, "
+              f"{self.loose_matches} matched by name only, {self.repeated} repeated answers, {unused} unused")
+
+class ReplayDriver(webdriver.Remote):
+    """Remote WebDriver whose commands are answered by a ReplayExecutor instead of a browser"""
+
+    def __init__(self, executor):
+        self.replay = executor
+        super().__init__(command_executor=executor, options=Options())
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+def create_replay_driver(path, latency="zero", strict=False):
+    """A driver that serves the recording at path back to whatever code drives it"""
+    header, entries = read_recording(path)
+    driver = ReplayDriver(ReplayExecutor(header, entries, latency, strict))
+    driver.base_url = header.get("base_url", YOUTUBE_URL)
+    return driver
+
+def run_phases(driver, base_url, workdir):
+    """
+    The scripted scrape and migration that `record` captures and `replay`
+    repeats: same arguments both times, so the same commands are sent.
+    Returns the number of items migrated.
+    """
+    # A fresh registry keeps the selector order (and so the probe commands) identical
+    set_default_registry(SelectorRegistry(os.path.join(workdir, "selector-stats.json")))
+    data_path = os.path.join(workdir, "youtube-data.json")
+    scrape_youtube_data(driver, base_url=base_url, output_path=data_path)
+    rate = TimingRate()
+    migrate_youtube_data(driver, workers=1, rate_controller=rate, plan=False, mode="1", base_url=base_url,
+                         data_path=data_path, retries=False)
+    return len(rate.latencies)
+
+def analyze_recording(path, top=10):
+    """Round trips per item and section, time per command, and repeated identical commands"""
+    header, entries = read_recording(path)
+    by_command = Counter(entry["command"] for entry in entries)
+    seconds = defaultdict(float)
+    per_item = defaultdict(int)
+    repeats = Counter()
+    last_response = {}
+    for entry in entries:
+        seconds[entry["command"]] += entry.get("seconds", 0)
+        if entry.get("item"):
+            per_item[entry["item"]] += 1
+        # Same command, same parameters, same answer as last time within one item: a candidate to drop
+        answer = json.dumps(entry.get("response", entry.get("error")), sort_keys=True)
+        scope = (entry.get("item"), entry["key"])
+        if last_response.get(scope) == answer:
+            repeats[entry["key"]] += 1
+        last_response[scope] = answer
+
+    print(f"\n--- Recording {os.path.basename(path)} ({header.get('recorded_at', 'unknown time')}) ---")
+    print(f"{len(entries)} commands, {sum(seconds.values()):.1f}s of round trips")
+    for command, count in by_command.most_common():
+        print(f"  {command:<28} {count:>7}  {seconds[command]:>8.2f}s")
+
+    sections = defaultdict(list)
+    for item, count in per_item.items():
+        sections[item.split(":", 1)[0]].append(count)
+    for section, counts in sorted(sections.items()):
+        print(f"{section}: {len(counts)} items, {sum(counts) / len(counts):.1f} commands per item "
+              f"(p95 {percentile(counts, 0.95)}, max {max(counts)})")
+
+    if repeats:
+        print("Repeated identical commands (same parameters and answer within an item):")
+        for key, count in repeats.most_common(top):
+            print(f"  {count:>6}x {key[:120]}")
+    return {"commands": dict(by_command), "per_item": dict(per_item), "repeats": dict(repeats)}
+
+def record_fixture_run(path, base_url=None, profile=None, headless=True, **fixture_options):
+    """Run the scripted phases in Chrome against the fixture server (or base_url) and record them to path"""
+    workdir = tempfile.mkdtemp(prefix="ytm-record-")
+    server = FixtureServer(**fixture_options).start() if base_url is None else None
+    driver = create_driver(user_data_dir=profile, headless=headless)
+    try:
+        target = base_url or server.base_url
+        with SessionRecorder(driver, path, target):
+            start = time.perf_counter()
+            migrated = run_phases(driver, target, workdir)
+        print(f"✓ Recorded run: {migrated} items migrated in {time.perf_counter() - start:.1f}s")
+    finally:
+        driver.quit()
+        if server:
+            server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def replay_run(path, latency="zero", strict=False):
+    """Repeat the scripted phases on a replay driver; returns the timings and command counts"""
+    driver = create_replay_driver(path, latency, strict)
+    workdir = tempfile.mkdtemp(prefix="ytm-replay-")
+    try:
+        with count_webdriver_commands(driver) as commands:
+            start = time.perf_counter()
+            migrated = run_phases(driver, driver.base_url, workdir)
+            elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    total = sum(commands.values())
+    print(f"\n✓ Replayed {migrated} migrated items in {elapsed:.2f}s ({latency} latency), "
+          f"{total} commands ({total / migrated if migrated else 0:.1f} per migrated item)")
+    driver.replay.report()
+    return {"seconds": elapsed, "migrated": migrated, "commands": dict(commands)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record a WebDriver session, or replay/analyze a recording")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    record = subparsers.add_parser("record", help="record the scripted run in Chrome")
+    record.add_argument("path")
+    record.add_argument("--subscriptions", type=int, default=50)
+    record.add_argument("--watch-later", type=int, default=300)
+    record.add_argument("--latency-ms", type=int, default=0)
+    record.add_argument("--base-url", help="record against this site instead of the fixture server")
+    record.add_argument("--profile", help="Chrome profile directory (e.g. a logged-in one for --base-url)")
+    record.add_argument("--headed", action="store_true", help="show the browser window")
+    replay = subparsers.add_parser("replay", help="repeat the scripted run against a recording, without Chrome")
+    replay.add_argument("path")
+    replay.add_argument("--latency", choices=["zero", "original"], default="zero")
+    replay.add_argument("--strict", action="store_true", help="fail on any command the recording lacks")
+    analyze = subparsers.add_parser("analyze", help="round trips per item and repeated commands in a recording")
+    analyze.add_argument("path")
+    args = parser.parse_args()
+
+    if args.action == "record":
+        options = {} if args.base_url else {
+            "subscriptions": args.subscriptions, "watch_later": args.watch_later, "latency_ms": args.latency_ms,
+        }
+        record_fixture_run(args.path, args.base_url, args.profile, not args.headed, **options)
+    elif args.action == "replay":
+        replay_run(args.path, args.latency, args.strict)
+    else:
+        analyze_recording(args.path)
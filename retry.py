@@ -0,0 +1,122 @@
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+# What a failed attempt is filed under; each class has its own retry policy
+TIMEOUT = "timeout"
+MISSING_ELEMENT = "missing-element"
+NOT_CONFIRMED = "not-confirmed"
+THROTTLED = "throttled"
+ERROR = "error"
+
+# attempts: tries in total, including the first; backoff: seconds before the
+# first retry, doubled for every further one up to max_backoff. Slow loads and
+# throttling usually pass; a missing button usually means an unavailable item
+# or a changed layout, so it only gets one late retry.
+RETRY_POLICIES = {
+    TIMEOUT: {"attempts": 4, "backoff": 30, "max_backoff": 300},
+    THROTTLED: {"attempts": 4, "backoff": 120, "max_backoff": 900},
+    NOT_CONFIRMED: {"attempts": 3, "backoff": 60, "max_backoff": 300},
+    MISSING_ELEMENT: {"attempts": 2, "backoff": 180, "max_backoff": 180},
+    ERROR: {"attempts": 3, "backoff": 30, "max_backoff": 300},
+}
+
+def classify_exception(e):
+    """Error class for an exception raised while handling an item"""
+    if isinstance(e, TimeoutException):
+        return TIMEOUT
+    if isinstance(e, (NoSuchElementException, StaleElementReferenceException)):
+        return MISSING_ELEMENT
+    return ERROR
+
+def _append_jsonl(path, record):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    record = dict(record, at=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+class RetryScheduler:
+    """
+    Holds failed items until their backoff has passed, so they are retried
+    later in the same run instead of in a manual rerun. Items that use up the
+    attempts their error class allows go to the dead-letter file; results that
+    probably worked but could not be confirmed go to the unconfirmed file for
+    re-verification. Thread-safe, so pool workers can report into one scheduler.
+    """
+
+    def __init__(self, policies=None, dead_letter_path="data/dead-letter.jsonl",
+                 unconfirmed_path="data/unconfirmed.jsonl", jitter=0.2):
+        self.policies = policies or RETRY_POLICIES
+        self.dead_letter_path = dead_letter_path
+        self.unconfirmed_path = unconfirmed_path
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._heap = []
+        self._attempts = {}
+        self._sequence = 0
+        self.dead = []
+        self.unconfirmed_items = []
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    def attempts(self, name, url):
+        with self._lock:
+            return self._attempts.get((name, url), 0)
+
+    def failed(self, name, url, error_class, detail=None):
+        """Record a failed attempt; returns True if a retry was scheduled, False if it was dead-lettered"""
+        policy = self.policies.get(error_class, self.policies[ERROR])
+        with self._lock:
+            attempts = self._attempts.get((name, url), 0) + 1
+            self._attempts[(name, url)] = attempts
+            if attempts >= policy["attempts"]:
+                record = {"section": name, "url": url, "error": error_class, "detail": detail, "attempts": attempts}
+                self.dead.append(record)
+                _append_jsonl(self.dead_letter_path, record)
+                return False
+            delay = min(policy["backoff"] * 2 ** (attempts - 1), policy["max_backoff"])
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+            self._sequence += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._sequence, name, url, error_class))
+        print(f"  ~ Retry {attempts}/{policy['attempts'] - 1} for {error_class} in {delay:.0f}s")
+        return True
+
+    def unconfirmed(self, name, url, detail=None):
+        """File a result that probably worked but was never confirmed on the page"""
+        record = {"section": name, "url": url, "detail": detail}
+        with self._lock:
+            self.unconfirmed_items.append(record)
+            _append_jsonl(self.unconfirmed_path, record)
+
+    def take_due(self, name=None):
+        """Remove and return (name, url, error_class) for every retry whose backoff has passed"""
+        now = time.monotonic()
+        due = []
+        keep = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                (due if name is None or entry[2] == name else keep).append(entry)
+            for entry in keep:
+                heapq.heappush(self._heap, entry)
+        return [(entry_name, url, error_class) for _, _, entry_name, url, error_class in due]
+
+    def next_due_in(self, name=None):
+        """Seconds until the next retry (of section name) is due, or None if none is waiting"""
+        with self._lock:
+            times = [entry[0] for entry in self._heap if name is None or entry[2] == name]
+        return max(0.0, min(times) - time.monotonic()) if times else None
+
+    def report(self):
+        print(f"\nRetries: {len(self.dead)} items dead-lettered, {len(self.unconfirmed_items)} unconfirmed")
+        if self.dead:
+            print(f"  Dead letters: {self.dead_letter_path}")
+        if self.unconfirmed_items:
+            print(f"  Unconfirmed (re-verify with a planned run): {self.unconfirmed_path}")
@@ -1,8 +1,229 @@
 from selenium import webdriver 
 from selenium.webdriver.common.by import By
 import time 
-import json 
+import json
 import os
+import re
+from delta import KnownRun, compute_delta, merge_partial, save_delta
+from initial_data import read_page_items
+from metrics import timed
+from pagination import load_continuations
+from readiness import navigate
+from selector_registry import default_registry
+from streaming import JsonlWriter, extend_jsonl_export, rewrite_jsonl_export
+from utils import DATA_KINDS, YOUTUBE_URL, ItemSet, canonical_key, count_webdriver_commands, load_youtube_data, save_youtube_data
+
+CHANNEL_PATTERNS = ["/channel/", "/@"]
+VIDEO_PATTERNS = ["/watch?v="]
+
+# Lists that put new items first, so an incremental scrape may stop at a run
+# of known ones. /feed/channels is not ordered by subscribe date: a new
+# channel can sort after any run of known ones, so it is always loaded in full.
+NEWEST_FIRST_KINDS = ("watch_later",)
+
+# Evaluated inside the page: runs every selector, filters and de-duplicates the
+# hrefs and returns them in one payload, so the whole extraction costs a single
+# WebDriver round trip instead of find_elements + get_attribute per element.
+BULK_EXTRACT_JS = """
+const selectors = arguments[0];
+const patterns = arguments[1];
+const requireText = arguments[2];
+const onlyNew = arguments[3];
+const seen = new Set();
+const records = [];
+const counts = {};
+for (const selector of selectors) {
+    let nodes = [];
+    try {
+        nodes = document.querySelectorAll(selector);
+    } catch (e) {
+        counts[selector] = -1;
+        continue;
+    }
+    counts[selector] = nodes.length;
+    for (const node of nodes) {
+        if (onlyNew && node.dataset.ytmExtracted) continue;
+        const anchor = node.href ? node : node.closest('a');
+        const href = anchor ? anchor.href : null;
+        if (!href || seen.has(href)) continue;
+        if (!patterns.some(pattern => href.includes(pattern))) continue;
+        const text = (node.innerText || '').trim();
+        if (requireText && !text) continue;
+        seen.add(href);
+        if (onlyNew) node.dataset.ytmExtracted = '1';
+        records.push({url: href, text: text, selector: selector});
+    }
+}
+return {records: records, counts: counts};
+"""
+
+def extract_links(driver, selectors, patterns, require_text=False, only_new=False):
+    """
+    Evaluate all selectors in one execute_script call and return (records, per-selector counts).
+    With only_new, nodes returned by an earlier only_new call are skipped, so a
+    growing page can be extracted batch by batch.
+    """
+    with timed("extract"):
+        result = driver.execute_script(BULK_EXTRACT_JS, selectors, patterns, require_text, only_new) or {}
+    return result.get("records", []), result.get("counts", {})
+
+def legacy_extract_links(driver, selectors, patterns, require_text=False):
+    """Per-element extraction (find_elements + get_attribute/.text per match), kept for comparison"""
+    records = []
+    seen = set()
+    for selector in selectors:
+        try:
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        except:
+            continue
+        for elem in elements:
+            try:
+                href = elem.get_attribute("href")
+                if not href or href in seen:
+                    continue
+                if not any(pattern in href for pattern in patterns):
+                    continue
+                text = elem.text.strip()
+                if require_text and not text:
+                    continue
+                seen.add(href)
+                records.append({'url': href, 'text': text, 'selector': selector})
+            except:
+                continue
+    return records
+
+def compare_extraction_paths(driver, selectors, patterns, require_text=False):
+    """Run the legacy and bulk extraction paths on the current page and report round trips and wall time"""
+    with count_webdriver_commands(driver) as legacy_counts:
+        start = time.perf_counter()
+        legacy_records = legacy_extract_links(driver, selectors, patterns, require_text)
+        legacy_elapsed = time.perf_counter() - start
+    
+    with count_webdriver_commands(driver) as bulk_counts:
+        start = time.perf_counter()
+        bulk_records, _ = extract_links(driver, selectors, patterns, require_text)
+        bulk_elapsed = time.perf_counter() - start
+    
+    print("\n--- Extraction comparison ---")
+    print(f"Legacy path: {len(legacy_records)} links, {sum(legacy_counts.values())} round trips, {legacy_elapsed:.2f}s")
+    print(f"Bulk path:   {len(bulk_records)} links, {sum(bulk_counts.values())} round trips, {bulk_elapsed:.2f}s")
+    
+    return {
+        "legacy": {"links": len(legacy_records), "round_trips": sum(legacy_counts.values()), "seconds": legacy_elapsed},
+        "bulk": {"links": len(bulk_records), "round_trips": sum(bulk_counts.values()), "seconds": bulk_elapsed},
+    }
+
+# Header text such as "3,214 videos" that carries the playlist's own item count
+PLAYLIST_COUNT_JS = """
+const candidates = document.querySelectorAll(
+    'ytd-playlist-byline-renderer, ytd-playlist-header-renderer #stats yt-formatted-string, ' +
+    'yt-content-metadata-view-model span, .metadata-stats yt-formatted-string'
+);
+for (const node of candidates) {
+    const text = (node.innerText || '').trim();
+    if (/video/i.test(text) && /\\d/.test(text)) return text;
+}
+return null;
+"""
+
+# Scrolls once, then waits for YouTube to append the next batch of list
+# renderers (arguments[1], e.g. YTD-PLAYLIST-VIDEO-RENDERER). Resolves as soon as the batch settles, when there is no
+# continuation spinner left (list complete), or after idleMs without new nodes.
+PLAYLIST_LOAD_JS = """
+const idleMs = arguments[0];
+const renderer = arguments[1];
+const done = arguments[arguments.length - 1];
+const count = () => document.getElementsByTagName(renderer).length;
+const hasContinuation = () => document.querySelector('ytd-continuation-item-renderer') !== null;
+let finished = false;
+let settleTimer = null;
+let observer = null;
+let idleTimer = null;
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(idleTimer);
+    clearTimeout(settleTimer);
+    done({count: count(), reason: reason, continuation: hasContinuation()});
+};
+if (!hasContinuation()) {
+    finish('complete');
+} else {
+    observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.tagName === renderer) {
+                    clearTimeout(settleTimer);
+                    settleTimer = setTimeout(() => finish('nodes'), 150);
+                    return;
+                }
+            }
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    idleTimer = setTimeout(() => finish(hasContinuation() ? 'idle' : 'complete'), idleMs);
+    window.scrollTo(0, document.documentElement.scrollHeight);
+}
+"""
+
+def read_playlist_item_count(driver):
+    """Return the item count reported by the playlist header, or None if it can't be read"""
+    try:
+        text = driver.execute_script(PLAYLIST_COUNT_JS)
+    except Exception:
+        return None
+    if not text:
+        return None
+    match = re.search(r"\d[\d,.\s]*", text)
+    if not match:
+        return None
+    digits = re.sub(r"\D", "", match.group())
+    return int(digits) if digits else None
+
+def legacy_scroll_to_bottom(driver):
+    """Original loader: fixed 2s sleep per scroll, stop on the first unchanged scrollHeight"""
+    last_height = driver.execute_script("return document.documentElement.scrollHeight")
+    while True:
+        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+        time.sleep(2)
+        new_height = driver.execute_script("return document.documentElement.scrollHeight")
+        if new_height == last_height:
+            break
+        last_height = new_height
+
+def load_playlist_items(driver, idle_timeout=10, expected_count=None, on_batch=None,
+                        renderer="YTD-PLAYLIST-VIDEO-RENDERER"):
+    """
+    Event-driven list loader: scroll, wait for new renderer nodes, and stop
+    once expected_count (default: the playlist header's count) is reached, the
+    continuation spinner is gone, or nothing new arrives within idle_timeout
+    seconds. on_batch(driver) is called after every round, e.g. to stream new
+    items out; a truthy return stops loading. Returns (count, stop reason).
+    """
+    if expected_count is None and renderer == "YTD-PLAYLIST-VIDEO-RENDERER":
+        expected_count = read_playlist_item_count(driver)
+        print(f"Playlist header reports {expected_count if expected_count is not None else 'an unknown number of'} items")
+    
+    driver.set_script_timeout(idle_timeout + 5)
+    loaded = 0
+    reason = None
+    while True:
+        with timed("scroll"):
+            result = driver.execute_async_script(PLAYLIST_LOAD_JS, int(idle_timeout * 1000), renderer)
+        loaded = result.get("count", 0)
+        reason = result.get("reason")
+        if on_batch and on_batch(driver):
+            reason = "caller stopped"
+            break
+        if expected_count and loaded >= expected_count:
+            reason = "count reached"
+            break
+        if reason in ("complete", "idle"):
+            break
+    
+    print(f"Loaded {loaded} list items (stopped: {reason})")
+    return loaded, reason
 
 def manual_subscription_scraper(driver):
     """
@@ -12,8 +233,7 @@ def manual_subscription_scraper(driver):
     print("This will help you find subscriptions interactively")
     
     # Navigate to subscriptions page
-    driver.get("https://www.youtube.com/feed/channels")
-    time.sleep(5)
+    navigate(driver, "https://www.youtube.com/feed/channels", "feed")
     
     print("\n1. Current page:", driver.current_url)
     print("2. Can you see your subscriptions on this page? (y/n)")
@@ -29,8 +249,7 @@ def manual_subscription_scraper(driver):
         
         for url in alternative_urls:
             print(f"\nTrying: {url}")
-            driver.get(url)
-            time.sleep(5)
+            navigate(driver, url)
             print("Can you see subscriptions now? (y/n)")
             if input().lower() == 'y':
                 break
@@ -39,23 +258,7 @@ def manual_subscription_scraper(driver):
     print("We'll try to find subscription links automatically...")
     
     # Try to find all links that might be subscriptions
-    all_links = driver.find_elements(By.TAG_NAME, "a")
-    subscription_links = []
-    
-    for link in all_links:
-        try:
-            href = link.get_attribute("href")
-            if href and (("/channel/" in href) or ("/@" in href)):
-                # Get the text to help identify
-                text = link.text.strip()
-                if text and href not in [sub['url'] for sub in subscription_links]:
-                    subscription_links.append({
-                        'url': href,
-                        'text': text,
-                        'element': link
-                    })
-        except:
-            continue
+    subscription_links, _ = extract_links(driver, ["a"], CHANNEL_PATTERNS, require_text=True)
     
     print(f"\nFound {len(subscription_links)} potential subscription links:")
     
@@ -87,21 +290,14 @@ def manual_subscription_scraper(driver):
         ".ytd-channel-name a"
     ]
     
+    records, counts = extract_links(driver, test_selectors, CHANNEL_PATTERNS)
     for selector in test_selectors:
-        try:
-            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            print(f"'{selector}': {len(elements)} elements")
-            if elements and len(elements) > 3:  # Likely found subscriptions
-                links = []
-                for elem in elements:
-                    href = elem.get_attribute("href")
-                    if href and (("/channel/" in href) or ("/@" in href)):
-                        links.append(href)
-                if links:
-                    print(f"  ✓ This selector found {len(links)} subscription URLs!")
-                    return links
-        except:
-            continue
+        print(f"'{selector}': {max(counts.get(selector, 0), 0)} elements")
+        if counts.get(selector, 0) > 3:  # Likely found subscriptions
+            links = [record['url'] for record in records if record['selector'] == selector]
+            if links:
+                print(f"  ✓ This selector found {len(links)} subscription URLs!")
+                return links
     
     print("\n❌ Automatic detection failed.")
     print("Manual steps:")
@@ -125,79 +321,240 @@ def manual_subscription_scraper(driver):
     
     return []
 
-# Integration function for your main scraper
-def scrape_youtube_data(driver):
-    data = {"subscriptions": [], "watch_later": []}
+def scrape_subscriptions(driver, compare_extraction=False, manual_fallback=True, on_item=None, base_url=YOUTUBE_URL,
+                         backend="initial-data", idle_timeout=10):
+    """
+    Scrape the logged-in account's subscriptions from /feed/channels into an
+    ItemSet; on_item(id) sees each new one. The "initial-data" backend reads
+    the page's embedded ytInitialData (following its continuation tokens)
+    and falls back to scrolling the page and the DOM selectors, also when a
+    continuation fetch fails. If the list still could not be loaded to its
+    end, the returned ItemSet has complete=False.
+    """
+    subscriptions = ItemSet("channel")
     
-    # Ensure data directory exists
-    os.makedirs("data", exist_ok=True)
+    # Try automatic first
+    navigate(driver, f"{base_url}/feed/channels", "feed")
     
-    print("=== SUBSCRIPTION SCRAPING ===")
+    if backend == "initial-data":
+        parsed = read_page_items(driver)
+        if parsed and parsed["channels"]:
+            _add_parsed(subscriptions, parsed["channels"], on_item)
+            pages, error = load_continuations(
+                driver, parsed["continuations"], lambda page: _add_parsed(subscriptions, page["channels"], on_item)
+            )
+            if error is None:
+                print(f"Found {len(subscriptions)} subscriptions in ytInitialData ({pages} continuation pages)")
+                return subscriptions
+            print(f"! Continuation fetch failed after {pages} pages ({error}), loading the rest from the DOM")
+        else:
+            print("No subscriptions in ytInitialData, falling back to DOM extraction")
     
-    # Try automatic first
-    driver.get("https://www.youtube.com/feed/channels")
-    time.sleep(5)
+    # Scroll until the channel list has no continuation spinner left
+    _, reason = load_playlist_items(driver, idle_timeout=idle_timeout, renderer="YTD-CHANNEL-RENDERER")
+    if reason != "complete":
+        print(f"! The channel list did not load to its end ({reason}); keeping unseen channels from the last snapshot")
+        subscriptions.complete = False
     
-    # Quick automatic attempt
-    quick_selectors = [
-        "ytd-channel-renderer #main-link",
-        "ytd-channel-renderer a[href*='/channel/']",
-        "a#channel-title"
-    ]
+    # Quick automatic attempt, selectors ordered by past success
+    registry = default_registry()
+    quick_selectors = [selector for _, selector in registry.ordered("feed")]
     
+    if compare_extraction:
+        compare_extraction_paths(driver, quick_selectors, CHANNEL_PATTERNS)
+    
+    start = time.perf_counter()
+    records, _ = extract_links(driver, quick_selectors, CHANNEL_PATTERNS)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    matched = {record['selector'] for record in records}
     for selector in quick_selectors:
-        try:
-            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            if elements:
-                for elem in elements:
-                    href = elem.get_attribute("href")
-                    if href and (("/channel/" in href) or ("/@" in href)):
-                        if href not in data["subscriptions"]:
-                            data["subscriptions"].append(href)
-        except:
-            continue
+        registry.record("feed", selector, selector in matched, elapsed_ms)
+    registry.save()
+    _add_records(subscriptions, records, on_item)
     
     # If automatic failed, try manual
-    if not data["subscriptions"]:
+    if not subscriptions and manual_fallback:
         print("Automatic scraping failed. Trying manual method...")
         manual_subs = manual_subscription_scraper(driver)
-        data["subscriptions"] = manual_subs
+        _add_records(subscriptions, [{'url': url} for url in manual_subs], on_item)
     
-    print(f"Subscriptions found: {len(data['subscriptions'])}")
+    return subscriptions
+
+def scrape_watch_later(driver, compare_extraction=False, scroll_loader="event", idle_timeout=10, on_item=None,
+                       base_url=YOUTUBE_URL, backend="initial-data", stop_at=None):
+    """Load the whole Watch Later playlist and return its videos as an ItemSet (see scrape_playlist)"""
+    return scrape_playlist(
+        driver, "WL", compare_extraction, scroll_loader, idle_timeout, on_item, base_url, backend, stop_at, "Watch Later"
+    )
+
+def scrape_playlist(driver, playlist_id, compare_extraction=False, scroll_loader="event", idle_timeout=10, on_item=None,
+                    base_url=YOUTUBE_URL, backend="initial-data", stop_at=None, label=None):
+    """
+    Load a whole playlist and return its videos as an ItemSet.
+    With on_item(id), videos are extracted batch by batch while the list loads.
+    The "initial-data" backend takes the first page from ytInitialData and
+    fetches the rest by continuation token from inside the page, without
+    rendering anything; it only scrolls the DOM if those fetches fail.
+    stop_at (a delta.KnownRun) ends loading at a run of already-known videos.
+    """
+    label = label or playlist_id
+    videos = ItemSet("video")
+    navigate(driver, f"{base_url}/playlist?list={playlist_id}", "playlist")
     
-    # Watch later scraping (your working code)
-    print("\n=== WATCH LATER SCRAPING ===")
-    driver.get("https://www.youtube.com/playlist?list=WL")
-    time.sleep(5)
+    if backend == "initial-data":
+        parsed = read_page_items(driver)
+        if parsed and parsed["videos"]:
+            tokens = [] if _add_parsed(videos, parsed["videos"], on_item, stop_at) else parsed["continuations"]
+            print(f"Found {len(videos)} videos in ytInitialData")
+            pages, error = load_continuations(
+                driver, tokens, lambda page: _add_parsed(videos, page["videos"], on_item, stop_at)
+            )
+            if error is None:
+                reported = parsed["reported_count"]
+                print(f"Loaded {pages} continuation pages: {len(videos)} videos"
+                      f"{f' (header reports {reported})' if reported is not None else ''}")
+                return videos
+            print(f"! Continuation fetch failed after {pages} pages ({error}), loading the rest from the DOM")
+        else:
+            print("No videos in ytInitialData, falling back to DOM extraction")
+    
+    def extract_batch(batch_driver):
+        records, _ = extract_links(batch_driver, ["a#video-title"], VIDEO_PATTERNS, only_new=True)
+        _add_records(videos, records, on_item)
+        return stop_at.feed([canonical_key(record['url'], "video") for record in records]) if stop_at else False
     
     # Scroll to load all videos
-    last_height = driver.execute_script("return document.documentElement.scrollHeight")
-    while True:
-        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-        time.sleep(2)
-        new_height = driver.execute_script("return document.documentElement.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
+    load_start = time.perf_counter()
+    if scroll_loader == "legacy":
+        legacy_scroll_to_bottom(driver)
+    else:
+        load_playlist_items(driver, idle_timeout=idle_timeout, on_batch=extract_batch if on_item or stop_at else None)
+    print(f"{label} loaded in {time.perf_counter() - load_start:.1f}s ({scroll_loader} loader)")
+    
+    if compare_extraction:
+        compare_extraction_paths(driver, ["a#video-title"], VIDEO_PATTERNS)
+    
+    extract_batch(driver)
     
-    videos = driver.find_elements(By.CSS_SELECTOR, "a#video-title")
-    for vid in videos:
+    return videos
+
+def _add_parsed(items, entries, on_item=None, stop_at=None):
+    """Add parsed entries; True once stop_at says the rest of the list is already known"""
+    _add_records(items, [{'url': entry['id']} for entry in entries], on_item)
+    return stop_at.feed([entry['id'] for entry in entries]) if stop_at else False
+
+def _add_records(items, records, on_item=None):
+    for record in records:
+        if items.add(record['url']) and on_item:
+            on_item(canonical_key(record['url'], items.kind))
+
+# Integration function for your main scraper
+def scrape_youtube_data(driver, compare_extraction=False, scroll_loader="event", idle_timeout=10, store=None,
+                        stream_path=None, base_url=YOUTUBE_URL, output_path="data/youtube-data.json",
+                        backend="initial-data", incremental=False, stop_after_known=20,
+                        delta_path="data/youtube-delta.json", on_item=None):
+    """
+    Scrape subscriptions and Watch Later into data/youtube-data.json. With
+    stream_path, every item is also appended to a JSONL file the moment it is
+    found, so a crash mid-scrape keeps everything collected so far; a rerun
+    adds to that file, and a finished scrape rewrites it to match the snapshot.
+    base_url points the scrape at another host, e.g. the local fixture server.
+    backend="dom" skips ytInitialData and only walks the rendered page.
+    With incremental, Watch Later stops loading after stop_after_known videos
+    in a row that the previous snapshot at output_path already had; the rest is
+    carried over and the additions/removals are written to delta_path.
+    Subscriptions are always loaded in full (see NEWEST_FIRST_KINDS); if that
+    fails, the unseen ones are kept from the last snapshot and the export.
+    on_item(section, id) sees every new item as it is found, e.g. to hand it
+    straight to a migration running alongside.
+    """
+    data = {"subscriptions": ItemSet("channel"), "watch_later": ItemSet("video")}
+    
+    previous = None
+    if incremental:
         try:
-            link = vid.get_attribute("href")
-            if link and "/watch?v=" in link:
-                if link not in data["watch_later"]:
-                    data["watch_later"].append(link)
-        except:
-            continue
+            previous = load_youtube_data(output_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            print("No previous snapshot, running a full scrape")
+    stops = {name: KnownRun(previous[name], stop_after_known) for name in NEWEST_FIRST_KINDS} if previous else {}
+    
+    # Ensure data directory exists
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    
+    writer = JsonlWriter(stream_path, append=True) if stream_path else None
+    if writer and writer.resumed:
+        print(f"Resuming {stream_path}: {writer.resumed} items from an earlier run are kept")
+    
+    def streamer(section):
+        if writer is None and on_item is None:
+            return None
+        def emit(item_id):
+            if writer:
+                writer.write(section, item_id)
+            if on_item:
+                on_item(section, item_id)
+        return emit
+    
+    try:
+        print("=== SUBSCRIPTION SCRAPING ===")
+        data["subscriptions"] = scrape_subscriptions(
+            driver, compare_extraction, on_item=streamer("subscriptions"), base_url=base_url, backend=backend,
+            idle_timeout=idle_timeout
+        )
+        
+        print(f"Subscriptions found: {len(data['subscriptions'])}")
+        if writer:
+            writer.sync()
+        
+        # Watch later scraping (your working code)
+        print("\n=== WATCH LATER SCRAPING ===")
+        data["watch_later"] = scrape_watch_later(
+            driver, compare_extraction, scroll_loader, idle_timeout, on_item=streamer("watch_later"), base_url=base_url,
+            backend=backend, stop_at=stops.get("watch_later")
+        )
+        
+        print(f"Watch later videos: {len(data['watch_later'])}")
+    finally:
+        if writer:
+            writer.close()
+            print(f"Streamed {writer.written} items to {stream_path}")
+    
+    # A list that could not be loaded to its end only adds to the last snapshot
+    unfinished = [name for name, items in data.items() if not items.complete]
+    if unfinished and not previous:
+        try:
+            previous = load_youtube_data(output_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            print(f"! No earlier snapshot to keep unseen items from; saving the partial {', '.join(unfinished)}")
     
-    print(f"Watch later videos: {len(data['watch_later'])}")
+    if previous:
+        delta = {}
+        for name in DATA_KINDS:
+            if name in unfinished:
+                data[name], delta[name] = merge_partial(previous[name], data[name])
+                note = " (partial load, nothing removed)"
+            else:
+                complete = name not in stops or not stops[name].reached
+                data[name], delta[name] = compute_delta(previous[name], data[name], complete)
+                note = "" if complete else " (stopped at known items)"
+            print(f"{name}: +{len(delta[name]['added'])} / -{len(delta[name]['removed'])} since the last snapshot{note}")
+        if incremental:
+            save_delta(delta_path, delta)
+            print(f"Delta saved to {delta_path}")
     
     # Save data
-    with open("data/youtube-data.json", "w") as f:
-        json.dump(data, f, indent=4)
+    save_youtube_data(output_path, data)
+    if stream_path and unfinished:
+        extend_jsonl_export(stream_path, data)
+    elif stream_path:
+        rewrite_jsonl_export(stream_path, data)
+    if store is not None:
+        for name, items in data.items():
+            added = store.add_items(name, items)
+            print(f"State store: {added} new {name} queued for migration")
 
-    print(f'\nData saved to youtube-data.json')
+    print(f'\nData saved to {os.path.basename(output_path)}')
     print(f'Subscriptions: {len(data["subscriptions"])}')
     print(f'Watch Later: {len(data["watch_later"])}')
     
-    return data
\ No newline at end of file
+    return data
@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+from metrics import timed
+
+# Candidate selectors per page type, in their default (hand-written) order
+SELECTOR_CANDIDATES = {
+    "subscribe": [
+        ('xpath', '//ytd-subscribe-button-renderer//button[contains(@aria-label, "Subscribe")]'),
+        ('xpath', '//ytd-subscribe-button-renderer//tp-yt-paper-button'),
+        ('xpath', '//button[contains(@aria-label, "Subscribe")]'),
+        ('xpath', '//button[contains(text(), "Subscribe")]'),
+        ('css', 'ytd-subscribe-button-renderer button'),
+        ('xpath', '//tp-yt-paper-button[contains(@aria-label, "Subscribe")]'),
+        ('xpath', '//yt-button-shape//button'),
+    ],
+    "save": [
+        ('xpath', '//button[@title="Save to Watch later"]'),
+        ('xpath', '//button[@aria-label="Save to Watch later"]'),
+        ('xpath', '//button[contains(@aria-label, "Save to")]'),
+        ('xpath', '//button[contains(@aria-label, "Save")]'),
+        ('xpath', '//ytd-playlist-add-to-button-renderer//button'),
+        ('xpath', '//button[contains(@title, "Save")]'),
+        ('css', '#top-level-buttons ytd-menu-renderer button'),
+        ('xpath', '//ytd-menu-renderer//button'),
+    ],
+    "watch-later-option": [
+        ('xpath', '//yt-formatted-string[text()="Watch later"]'),
+        ('xpath', '//span[text()="Watch later"]'),
+        ('xpath', '//ytd-playlist-add-to-button-renderer//span[contains(text(), "Watch later")]'),
+    ],
+    "playlist-menu": [
+        ('xpath', '//ytd-playlist-header-renderer//button[@aria-label="More actions"]'),
+        ('xpath', '//yt-page-header-renderer//button[@aria-label="More actions"]'),
+        ('css', 'ytd-playlist-header-renderer ytd-menu-renderer button'),
+        ('xpath', '//button[@aria-label="More actions"]'),
+    ],
+    "add-all-option": [
+        ('xpath', '//ytd-menu-service-item-renderer//yt-formatted-string[contains(text(), "Add all to")]'),
+        ('xpath', '//tp-yt-paper-item[contains(., "Add all to")]'),
+        ('xpath', '//*[@role="menuitem"][contains(., "Add all to")]'),
+    ],
+    "playlist-option": [
+        ('xpath', '//ytd-playlist-add-to-option-renderer//yt-formatted-string[@id="label"]'),
+        ('xpath', '//ytd-playlist-add-to-option-renderer//yt-formatted-string'),
+        ('css', 'tp-yt-paper-checkbox #label'),
+        ('xpath', '//yt-list-item-view-model//span'),
+    ],
+    "create-playlist-option": [
+        ('xpath', '//ytd-add-to-playlist-create-renderer//*[contains(text(), "Create new playlist")]'),
+        ('xpath', '//button[contains(., "New playlist")]'),
+        ('xpath', '//*[@role="button"][contains(., "Create new playlist")]'),
+    ],
+    "playlist-title-input": [
+        ('css', 'ytd-add-to-playlist-create-renderer input'),
+        ('css', 'tp-yt-paper-dialog textarea'),
+        ('xpath', '//input[@placeholder="Choose a title"]'),
+        ('xpath', '//textarea[contains(@placeholder, "title")]'),
+    ],
+    "create-playlist-button": [
+        ('xpath', '//ytd-button-renderer[@id="create-button"]//button'),
+        ('xpath', '//ytd-add-to-playlist-create-renderer//button[normalize-space(.)="Create"]'),
+        ('xpath', '//button[@aria-label="Create"]'),
+    ],
+    "feed": [
+        ('css', "ytd-channel-renderer #main-link"),
+        ('css', "ytd-channel-renderer a[href*='/channel/']"),
+        ('css', "a#channel-title"),
+    ],
+}
+
+class SelectorRegistry:
+    """
+    Hit/miss counts and latency per selector per page type, persisted between
+    runs. ordered() puts the selectors that have worked best first, so the
+    probe reports the selector that currently works.
+    """
+
+    def __init__(self, path="data/selector-stats.json", candidates=SELECTOR_CANDIDATES, save_every=10):
+        self.path = path
+        self.candidates = candidates
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.stats = {}
+        try:
+            with open(path, "r") as f:
+                self.stats = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def _entry(self, page_type, selector):
+        return self.stats.setdefault(page_type, {}).setdefault(
+            selector, {"hits": 0, "misses": 0, "total_ms": 0.0}
+        )
+
+    def ordered(self, page_type):
+        """Candidates for page_type sorted by smoothed success rate, then mean latency, then default order"""
+        candidates = self.candidates.get(page_type, [])
+        with self._lock:
+            page_stats = self.stats.get(page_type, {})
+
+            def score(indexed):
+                index, (selector_type, selector) = indexed
+                entry = page_stats.get(selector, {"hits": 0, "misses": 0, "total_ms": 0.0})
+                attempts = entry["hits"] + entry["misses"]
+                success_rate = (entry["hits"] + 1) / (attempts + 2)
+                mean_ms = entry["total_ms"] / attempts if attempts else 0.0
+                return (-success_rate, mean_ms, index)
+
+            return [candidate for _, candidate in sorted(enumerate(candidates), key=score)]
+
+    def record(self, page_type, selector, hit, latency_ms):
+        with self._lock:
+            entry = self._entry(page_type, selector)
+            entry["hits" if hit else "misses"] += 1
+            entry["total_ms"] += latency_ms
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.stats, f, indent=4)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+
+_default_registry = None
+
+def default_registry():
+    """Registry shared by scraper.py and migrator.py within one process"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = SelectorRegistry()
+    return _default_registry
+
+def set_default_registry(registry):
+    """Swap the shared registry, e.g. so a benchmark run keeps its stats out of data/"""
+    global _default_registry
+    _default_registry = registry
+
+# Evaluates every candidate selector (XPath or CSS) inside the page on each
+# poll and returns the first visible, enabled match in priority order, so a
+# lookup is one round trip however many selectors miss.
+PROBE_JS = """
+const candidates = arguments[0];
+const required = arguments[1];
+const timeoutMs = arguments[2];
+const exact = arguments[3];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const query = (type, selector) => {
+    try {
+        if (type === 'xpath') {
+            const snapshot = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+            return nodes;
+        }
+        return Array.from(document.querySelectorAll(selector));
+    } catch (e) {
+        return [];
+    }
+};
+const usable = (element) => {
+    if (element.disabled || element.getAttribute('aria-disabled') === 'true') return false;
+    const rect = element.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    const style = getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+};
+const check = () => {
+    for (let index = 0; index < candidates.length; index++) {
+        const [type, selector] = candidates[index];
+        for (const element of query(type, selector)) {
+            if (!usable(element)) continue;
+            const text = (element.innerText || '').trim();
+            const ariaLabel = element.getAttribute('aria-label') || '';
+            const title = element.getAttribute('title') || '';
+            const label = (text + ' ' + ariaLabel + ' ' + title).toLowerCase();
+            if (required && !required.some(word => exact ? text.toLowerCase() === word : label.includes(word))) continue;
+            done({element: element, index: index, selector: selector, text: text,
+                  aria_label: ariaLabel, title: title, ms: performance.now() - start});
+            return;
+        }
+    }
+    if (performance.now() - start >= timeoutMs) {
+        done(null);
+        return;
+    }
+    setTimeout(check, 100);
+};
+check();
+"""
+
+def probe(driver, page_type, timeout=5, required=None, registry=None, exact=False):
+    """
+    Look for page_type's selectors all at once, inside the page, until one has
+    a visible, enabled match whose text/aria-label/title contains one of the
+    required words (with exact, whose text is one of them). Returns a dict with element, selector, text, aria_label,
+    title and ms, or None on timeout. Outcomes feed the selector registry.
+    """
+    registry = registry or default_registry()
+    candidates = registry.ordered(page_type)
+    driver.set_script_timeout(timeout + 5)
+    try:
+        with timed("locate"):
+            result = driver.execute_async_script(
+                PROBE_JS, [list(candidate) for candidate in candidates], required, int(timeout * 1000), exact
+            )
+    except Exception as e:
+        print(f"Selector probe for {page_type} failed: {e}")
+        result = None
+    
+    # Everything ranked ahead of the winner missed; on timeout, everything did
+    tried = candidates[:result["index"]] if result else candidates
+    elapsed_ms = result["ms"] if result else timeout * 1000
+    for _, selector in tried:
+        registry.record(page_type, selector, False, elapsed_ms)
+    if result:
+        registry.record(page_type, result["selector"], True, elapsed_ms)
+    return result
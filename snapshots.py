@@ -0,0 +1,98 @@
+import gzip
+import os
+import re
+import sys
+import time
+
+# Selectors the debug report checks on each page type
+DEBUG_SELECTORS = {
+    "channel": [
+        ('xpath', '//ytd-subscribe-button-renderer'),
+        ('xpath', '//button[contains(@aria-label, "Subscribe")]'),
+        ('xpath', '//button[contains(text(), "Subscribe")]'),
+        ('css', 'ytd-subscribe-button-renderer button'),
+        ('xpath', '//tp-yt-paper-button[contains(@aria-label, "Subscribe")]'),
+        ('xpath', '//yt-button-shape[contains(@aria-label, "Subscribe")]'),
+        ('css', '#subscribe-button'),
+    ],
+    "video": [
+        ('xpath', '//button[@aria-label="Save to Watch later"]'),
+        ('xpath', '//button[contains(@aria-label, "Save")]'),
+        ('css', '#top-level-buttons ytd-menu-renderer button'),
+        ('xpath', '//ytd-menu-renderer//button[contains(@aria-label, "Save")]'),
+    ],
+}
+
+HEADER_RE = re.compile(r"<!-- snapshot url=(\S*) page_type=(\S*) reason=(\S*) -->")
+
+def capture_snapshot(driver, url, page_type, reason, directory="data/snapshots"):
+    """Save the current page_source gzip-compressed; one read of the DOM, no per-element calls"""
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", url.split("youtube.com")[-1]).strip("_")[:60] or "page"
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{page_type}-{slug}.html.gz")
+    header = f"<!-- snapshot url={url} page_type={page_type} reason={reason} -->\n"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(header)
+        f.write(driver.page_source)
+    return path
+
+def load_snapshot(path):
+    """Return (html, metadata) for a saved snapshot"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        html = f.read()
+    match = HEADER_RE.match(html)
+    metadata = {}
+    if match:
+        metadata = {"url": match.group(1), "page_type": match.group(2), "reason": match.group(3)}
+    return html, metadata
+
+def diagnose_snapshot(path, page_type=None):
+    """Run the debug selector report against a saved snapshot with lxml instead of a live browser"""
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        print("✗ Offline diagnostics need lxml: pip install lxml cssselect")
+        return []
+
+    html, metadata = load_snapshot(path)
+    page_type = page_type or metadata.get("page_type", "channel")
+    tree = lxml_html.fromstring(html)
+
+    print(f"\n=== DEBUGGING {page_type.upper()} SNAPSHOT ===")
+    print(f"Snapshot: {path}")
+    print(f"URL: {metadata.get('url', 'unknown')} (reason: {metadata.get('reason', 'unknown')})")
+    print("Testing selectors:")
+    found_elements = []
+
+    for selector_type, selector in DEBUG_SELECTORS.get(page_type, DEBUG_SELECTORS["channel"]):
+        try:
+            if selector_type == "xpath":
+                elements = tree.xpath(selector)
+            else:
+                elements = tree.cssselect(selector)
+        except Exception as e:
+            print(f"  {selector}: Error - {e}")
+            continue
+
+        print(f"  {selector}: Found {len(elements)} elements")
+
+        for i, elem in enumerate(elements[:3]):  # Show first 3
+            text = " ".join(elem.text_content().split())
+            aria_label = elem.get('aria-label') or ''
+            title = elem.get('title') or ''
+            print(f"    Element {i+1}: text='{text}', aria-label='{aria_label}', title='{title}'")
+            found_elements.append({
+                'selector': selector,
+                'text': text,
+                'aria_label': aria_label,
+                'title': title
+            })
+
+    return found_elements
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python snapshots.py <snapshot.html.gz> [...]")
+        sys.exit(1)
+    for snapshot_path in sys.argv[1:]:
+        diagnose_snapshot(snapshot_path)
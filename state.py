@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import threading
+import time
+
+PENDING = "pending"
+DONE = "done"
+ALREADY_PRESENT = "already-present"
+FAILED = "failed"
+SKIPPED = "skipped"
+# The click went through but the page never showed the result
+UNCONFIRMED = "unconfirmed"
+
+# Statuses that count as a successful operation in the migration summary
+SUCCESS_STATUSES = (DONE, ALREADY_PRESENT, SKIPPED, UNCONFIRMED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_items_kind_status_position ON items (kind, status, position);
+"""
+
+class StateStore:
+    """
+    SQLite-backed record of every scraped item and its migration status, so an
+    interrupted run can resume with only the items that were not finished.
+    Items are keyed by section ('subscriptions' / 'watch_later') and canonical ID.
+    """
+
+    def __init__(self, path="data/migration-state.db"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add_items(self, kind, item_ids):
+        """Insert new items as pending (existing ones keep their status); returns how many were new"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute("SELECT COALESCE(MAX(position), 0) FROM items WHERE kind = ?", (kind,))
+            position = cursor.fetchone()[0]
+            added = 0
+            self._conn.execute("BEGIN")
+            try:
+                for item_id in item_ids:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO items (kind, item_id, position, status, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (kind, item_id, position + 1, PENDING, now, now),
+                    )
+                    if cursor.rowcount:
+                        position += 1
+                        added += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def next_batch(self, kind, limit=100, after_position=0, max_attempts=3):
+        """Next (position, item_id) rows still to do: pending, or failed with attempts left"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT position, item_id FROM items "
+                "WHERE kind = ? AND position > ? "
+                "AND (status = ? OR (status = ? AND attempts < ?)) "
+                "ORDER BY position LIMIT ?",
+                (kind, after_position, PENDING, FAILED, max_attempts, limit),
+            )
+            return cursor.fetchall()
+
+    def unfinished(self, kind, batch_size=500, max_attempts=3):
+        """Yield the canonical IDs that a resumed run still has to process, in scrape order"""
+        after = 0
+        while True:
+            rows = self.next_batch(kind, batch_size, after, max_attempts)
+            if not rows:
+                return
+            for position, item_id in rows:
+                yield item_id
+            after = rows[-1][0]
+
+    def mark(self, kind, item_id, status, error=None):
+        """Record the outcome of one attempt"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE items SET status = ?, attempts = attempts + 1, last_error = ?, updated_at = ? "
+                "WHERE kind = ? AND item_id = ?",
+                (status, error, time.time(), kind, item_id),
+            )
+
+    def status(self, kind, item_id):
+        """Current status of one item, or None if it was never added"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT status FROM items WHERE kind = ? AND item_id = ?", (kind, item_id))
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    def counts(self, kind):
+        """Number of items per status"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT status, COUNT(*) FROM items WHERE kind = ? GROUP BY status", (kind,)
+            )
+            return dict(cursor.fetchall())
@@ -0,0 +1,128 @@
+import json
+import os
+import time
+from utils import DATA_KINDS, YOUTUBE_URL, canonical_url
+
+class JsonlWriter:
+    """
+    Appends one canonical record per scraped item ({"section": ..., "id": ...})
+    as soon as it is found, fsyncing every fsync_every records or
+    fsync_interval seconds so a crash loses at most the last few items.
+    With append, an existing export (e.g. from a run that crashed) is kept and
+    only items it doesn't have yet are added.
+    """
+
+    def __init__(self, path, fsync_every=50, fsync_interval=5.0, append=False):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._seen = set()
+        torn = False
+        if append and os.path.exists(path):
+            self._seen = set(iter_jsonl_items(path))
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        if torn:
+            # Finish a line cut off by a crash so the next record starts on its own
+            self._file.write("\n")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.written = 0
+        self.resumed = len(self._seen)
+
+    def write(self, section, item_id):
+        """Append one record; returns False if the export already has it"""
+        if (section, item_id) in self._seen:
+            return False
+        self._seen.add((section, item_id))
+        self._file.write(json.dumps({"section": section, "id": item_id}) + "\n")
+        self.written += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        return True
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def iter_jsonl_items(path, section=None):
+    """Lazily yield (section, id) from a JSONL export, skipping a torn last line left by a crash"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if section is None or record.get("section") == section:
+                yield record.get("section"), record.get("id")
+
+class JsonlSection:
+    """
+    Lazy, re-iterable view of one section of a JSONL export. Iterates canonical
+    IDs (or URLs with as_urls) without loading the file; duplicates are dropped.
+    """
+
+    def __init__(self, path, section, as_urls=False, base_url=YOUTUBE_URL):
+        self.path = path
+        self.section = section
+        self.kind = DATA_KINDS[section]
+        self.as_urls = as_urls
+        self.base_url = base_url
+        self._length = None
+
+    def __iter__(self):
+        seen = set()
+        for _, item_id in iter_jsonl_items(self.path, self.section):
+            if item_id is None or item_id in seen:
+                continue
+            seen.add(item_id)
+            yield canonical_url(item_id, self.kind, self.base_url) if self.as_urls else item_id
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+
+    def urls(self, base_url=YOUTUBE_URL):
+        return JsonlSection(self.path, self.section, as_urls=True, base_url=base_url)
+
+def rewrite_jsonl_export(path, data):
+    """Replace the export with exactly the items in data ({section: ItemSet}), e.g. after a complete scrape"""
+    temp_path = path + ".tmp"
+    with JsonlWriter(temp_path) as writer:
+        for section, items in data.items():
+            for item_id in items:
+                writer.write(section, item_id)
+    os.replace(temp_path, path)
+
+def extend_jsonl_export(path, data):
+    """Add the items in data the export doesn't have yet, keeping everything already in it"""
+    with JsonlWriter(path, append=True) as writer:
+        for section, items in data.items():
+            for item_id in items:
+                writer.write(section, item_id)
+
+def open_jsonl_export(path):
+    """Lazy equivalent of utils.load_youtube_data for a streamed export"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return {section: JsonlSection(path, section) for section in DATA_KINDS}
@@ -0,0 +1,108 @@
+from collections import deque
+from metrics import timed
+from readiness import install_event_hook
+
+# Marks the outgoing document before the tab navigates, so the wait below can
+# tell the new page from the old one still on screen.
+PRELOAD_JS = """
+window.__ytmPreloading = true;
+window.location.href = arguments[0];
+"""
+
+# Resolves once the tab has committed to the new document (the marker is gone)
+# and that document has parsed, or after capMs.
+WAIT_COMMITTED_JS = """
+const capMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const check = () => {
+    const committed = !window.__ytmPreloading && document.readyState !== 'loading';
+    if (committed || performance.now() - start >= capMs) {
+        done(committed);
+    } else {
+        setTimeout(check, 50);
+    }
+};
+check();
+"""
+
+def open_tabs(driver, depth):
+    """The current tab plus depth-1 new ones, each with the readiness hook (and lean blocking) installed"""
+    from browser import apply_lean_mode
+
+    handles = [driver.current_window_handle]
+    for _ in range(depth - 1):
+        driver.switch_to.new_window("tab")
+        handle = driver.current_window_handle
+        install_event_hook(driver, handle)
+        if getattr(driver, "lean_mode", False):
+            apply_lean_mode(driver)
+        handles.append(handle)
+    driver.switch_to.window(handles[0])
+    return handles
+
+def close_tabs(driver, handles):
+    """Close every tab but the first and focus it again"""
+    for handle in handles[1:]:
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except Exception:
+            pass
+    driver.switch_to.window(handles[0])
+
+def wait_committed(driver, cap=15):
+    driver.set_script_timeout(cap + 5)
+    try:
+        return driver.execute_async_script(WAIT_COMMITTED_JS, int(cap * 1000))
+    except Exception:
+        return False
+
+def run_tab_pipeline(driver, items, handle_item, rate, label, depth=3):
+    """
+    Process items in one browser session with depth tabs: while item i's tab
+    is focused and handled, items i+1 … i+depth-1 are already loading in the
+    other tabs. handle_item(driver, item, preloaded) runs with the item's tab
+    focused; with preloaded, the page has committed and it must only wait for
+    readiness. Without it the tab may still show the previous item's page, so
+    handle_item has to navigate to the item itself. rate paces the items
+    (ratelimit.Unpaced if handle_item acquires it within its metrics record).
+    Returns the per-item results in item order.
+    """
+    handles = open_tabs(driver, depth)
+    free = deque(handles)
+    loading = deque()
+    upcoming = iter(enumerate(items))
+    results = [None] * len(items)
+    total = len(items)
+
+    def preload_next():
+        entry = next(upcoming, None)
+        if entry is None:
+            return False
+        handle = free.popleft()
+        driver.switch_to.window(handle)
+        with timed("preload"):
+            driver.execute_script(PRELOAD_JS, entry[1])
+        loading.append((entry[0], entry[1], handle))
+        return True
+
+    try:
+        while free and preload_next():
+            pass
+        while loading:
+            index, item, handle = loading.popleft()
+            driver.switch_to.window(handle)
+            with timed("rate_limit_sleep"):
+                rate.acquire()
+            print(f"\n[tab {handles.index(handle) + 1}] Processing {label} {index + 1}/{total}: {item}")
+            with timed("commit"):
+                committed = wait_committed(driver)
+            if not committed:
+                print(f"  ! Preloaded tab did not commit in time, loading {item} again")
+            results[index] = handle_item(driver, item, committed)
+            free.append(handle)
+            preload_next()
+    finally:
+        close_tabs(driver, handles)
+    return results
@@ -0,0 +1,37 @@
+import os
+import pytest
+from initial_data import initial_data_from_source, parse_initial_data
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+def parse_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return parse_initial_data(initial_data_from_source(f.read()))
+
+def ids(entries):
+    return [entry["id"] for entry in entries]
+
+def test_feed_channels():
+    parsed = parse_fixture("feed-channels.html")
+    assert ids(parsed["channels"]) == ["@fixturechannel", "UCuAXFkgsw1L7xaCfnd5JJOw", "@anotherhandle"]
+    assert parsed["continuations"] == []
+
+def test_watch_later_playlist():
+    parsed = parse_fixture("playlist-wl.html")
+    assert ids(parsed["videos"]) == ["dQw4w9WgXcQ", "9bZkp7q19f0", "kJQP7kiw5Fk"]
+    assert len(parsed["continuations"]) == 1
+    assert parsed["reported_count"] == 250
+
+def test_feed_playlists():
+    parsed = parse_fixture("feed-playlists.html")
+    assert ids(parsed["playlists"]) == ["WL", "PLaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa", "PLbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb"]
+    assert len(parsed["continuations"]) == 1
+
+@pytest.mark.parametrize("name", sorted(name for name in os.listdir(FIXTURE_DIR) if name.endswith(".html")))
+def test_every_fixture_parses(name):
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        source = f.read()
+    data = initial_data_from_source(source)
+    if data is not None:
+        parsed = parse_initial_data(data)
+        assert set(parsed) >= {"channels", "videos", "playlists", "continuations", "reported_count"}
@@ -0,0 +1,152 @@
+import json
+import re
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+@contextmanager
+def count_webdriver_commands(driver):
+    """Count every WebDriver command (one HTTP round trip each) sent while the block runs"""
+    counts = Counter()
+    executor = driver.command_executor
+    original_execute = executor.execute
+
+    def counting_execute(command, params):
+        counts[command] += 1
+        return original_execute(command, params)
+
+    executor.execute = counting_execute
+    try:
+        yield counts
+    finally:
+        executor.execute = original_execute
+
+
+YOUTUBE_URL = "https://www.youtube.com"
+
+VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+CHANNEL_ID_RE = re.compile(r"^UC[A-Za-z0-9_-]{22}$")
+
+
+def video_id(url):
+    """Return the 11-character video ID of a watch/shorts/youtu.be URL (or a bare ID), else None"""
+    if not url:
+        return None
+    url = url.strip()
+    if VIDEO_ID_RE.match(url):
+        return url
+    parsed = urlsplit(url if "//" in url else "https://" + url)
+    host = parsed.netloc.lower()
+    path = parsed.path
+    candidate = None
+    if host.endswith("youtu.be"):
+        candidate = path.strip("/").split("/")[0]
+    elif path == "/watch":
+        candidate = (parse_qs(parsed.query).get("v") or [None])[0]
+    else:
+        parts = path.strip("/").split("/")
+        if len(parts) >= 2 and parts[0] in ("shorts", "embed", "live", "v"):
+            candidate = parts[1]
+    if candidate and VIDEO_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def channel_id(url):
+    """Return a channel key ('@handle', 'UC…' channel ID, or legacy 'c/…'/'user/…') for a channel URL, else None"""
+    if not url:
+        return None
+    url = url.strip()
+    if url.startswith("@"):
+        return url.split("/")[0].lower()
+    if CHANNEL_ID_RE.match(url):
+        return url
+    if url.startswith(("c/", "user/")):
+        url = "/" + url
+    parsed = urlsplit(url if "//" in url or url.startswith("/") else "https://" + url)
+    parts = [unquote(part) for part in parsed.path.strip("/").split("/") if part]
+    if not parts:
+        return None
+    if parts[0].startswith("@") and len(parts[0]) > 1:
+        return parts[0].lower()
+    if parts[0] == "channel" and len(parts) > 1 and CHANNEL_ID_RE.match(parts[1]):
+        return parts[1]
+    if parts[0] in ("c", "user") and len(parts) > 1:
+        return f"{parts[0]}/{parts[1]}"
+    return None
+
+
+def canonical_key(url, kind):
+    """Reduce a URL (or bare ID) of the given kind ('video' or 'channel') to its canonical ID"""
+    return video_id(url) if kind == "video" else channel_id(url)
+
+
+def canonical_url(key, kind, base_url=YOUTUBE_URL):
+    """Rebuild the shortest stable URL for a canonical ID (base_url swaps in e.g. the fixture server)"""
+    if kind == "video":
+        return f"{base_url}/watch?v={key}"
+    if key.startswith("@") or "/" in key:
+        return f"{base_url}/{key}"
+    return f"{base_url}/channel/{key}"
+
+
+class ItemSet:
+    """Insertion-ordered set of canonical YouTube IDs with O(1) membership checks"""
+
+    # False when a scrape could not load the list to its end (see scrape_subscriptions)
+    complete = True
+
+    def __init__(self, kind, items=()):
+        self.kind = kind
+        self._keys = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, url):
+        """Add a URL or ID; returns True if it was new, False if duplicate or unrecognised"""
+        key = canonical_key(url, self.kind)
+        if key is None or key in self._keys:
+            return False
+        self._keys[key] = None
+        return True
+
+    def __contains__(self, url):
+        key = canonical_key(url, self.kind)
+        return key is not None and key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def urls(self, base_url=YOUTUBE_URL):
+        return [canonical_url(key, self.kind, base_url) for key in self._keys]
+
+    def to_compact(self):
+        return list(self._keys)
+
+    @classmethod
+    def from_compact(cls, kind, keys):
+        return cls(kind, keys)
+
+
+# Which ItemSet kind each section of youtube-data.json holds
+DATA_KINDS = {"subscriptions": "channel", "watch_later": "video"}
+
+
+def save_youtube_data(path, data):
+    """Write ItemSets in the compact on-disk form (IDs instead of full URLs)"""
+    payload = {"format": "ids"}
+    for name, items in data.items():
+        payload[name] = items.to_compact()
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=4)
+
+
+def load_youtube_data(path):
+    """Load youtube-data.json (compact IDs or legacy full URLs) into canonical, de-duplicated ItemSets"""
+    with open(path, "r") as f:
+        raw = json.load(f)
+    return {name: ItemSet(kind, raw.get(name, [])) for name, kind in DATA_KINDS.items()}
@@ -0,0 +1,87 @@
+import queue
+import threading
+from metrics import timed
+from state import FAILED, SUCCESS_STATUSES
+from utils import YOUTUBE_URL
+
+def copy_session(source_driver, target_driver, base_url=YOUTUBE_URL):
+    """Copy the logged-in YouTube cookies from one driver into another"""
+    cookies = source_driver.get_cookies()
+    target_driver.get(base_url)
+    target_driver.delete_all_cookies()
+    for cookie in cookies:
+        cookie = {key: value for key, value in cookie.items() if key != "sameSite" or value in ("Strict", "Lax", "None")}
+        try:
+            target_driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"  ! Could not copy cookie {cookie.get('name')}: {e}")
+    target_driver.refresh()
+
+def start_worker_drivers(source_driver, workers, driver_factory, base_url=YOUTUBE_URL):
+    """Return source_driver plus workers-1 new drivers sharing its login cookies"""
+    source_driver.get(base_url)
+    drivers = [source_driver]
+    for n in range(1, workers):
+        print(f"Starting browser worker {n + 1}/{workers}...")
+        try:
+            driver = driver_factory()
+            copy_session(source_driver, driver, base_url)
+            drivers.append(driver)
+            print(f"✓ Worker {n + 1} ready")
+        except Exception as e:
+            print(f"✗ Failed to start worker {n + 1}: {e}")
+    return drivers
+
+def stop_worker_drivers(drivers):
+    for driver in drivers:
+        try:
+            driver.quit()
+        except:
+            pass
+
+def run_worker_pool(drivers, items, handle_item, rate, label):
+    """
+    Process items across all drivers from a shared queue, paced by one shared
+    rate controller (anything with acquire(), e.g. RateCap or AIMDRateController).
+    Pass ratelimit.Unpaced when handle_item acquires the controller itself, so
+    the wait is counted in the item's metrics record.
+    Returns (successful, failed, per-worker stats).
+    """
+    work = queue.Queue()
+    for i, item in enumerate(items, 1):
+        work.put((i, item))
+    total = len(items)
+    stats = [{"worker": n + 1, "successful": 0, "failed": 0} for n in range(len(drivers))]
+    
+    def worker(n, driver):
+        while True:
+            try:
+                i, item = work.get_nowait()
+            except queue.Empty:
+                return
+            with timed("rate_limit_sleep"):
+                rate.acquire()
+            print(f"\n[w{n + 1}] Processing {label} {i}/{total}: {item}")
+            try:
+                status = handle_item(driver, item)
+            except Exception as e:
+                print(f"[w{n + 1}] ✗ Unexpected error on {item}: {e}")
+                status = FAILED
+            if status in SUCCESS_STATUSES:
+                stats[n]["successful"] += 1
+            else:
+                stats[n]["failed"] += 1
+    
+    threads = [threading.Thread(target=worker, args=(n, driver), daemon=True) for n, driver in enumerate(drivers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    print(f"\nPer-worker {label} results:")
+    for worker_stats in stats:
+        print(f"  Worker {worker_stats['worker']}: {worker_stats['successful']} successful, {worker_stats['failed']} failed")
+    
+    successful = sum(worker_stats["successful"] for worker_stats in stats)
+    failed = sum(worker_stats["failed"] for worker_stats in stats)
+    return successful, failed, stats